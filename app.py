@@ -6,21 +6,204 @@ Versión Optimizada con Clave RAG123 y Sistema de Reportes Mejorado
 """
 
 import os
+import csv
+import gzip
+import hashlib
+import hmac
+import io
 import json
-from datetime import datetime
-from flask import Flask, render_template_string, request, jsonify, session, redirect, url_for, flash
+import math
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+
+import numpy as np
+from flask import (Flask, render_template, request, jsonify, session, redirect, url_for, flash,
+                   get_flashed_messages, stream_with_context)
+from flask.sessions import SecureCookieSessionInterface
+from jinja2 import ChoiceLoader, FileSystemBytecodeCache, ModuleLoader
+from markupsafe import Markup
+
+# orjson es opcional: serialización JSON más rápida, con respaldo en json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# htmlmin es opcional: minifica el HTML servido cuando MINIFY_HTML=1
+try:
+    import htmlmin
+except ImportError:
+    htmlmin = None
+
+# Flask-Compress es opcional: comprime las respuestas con Brotli o gzip
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+# csscompressor es opcional: minifica una vez la hoja de estilos al arrancar
+try:
+    import csscompressor
+except ImportError:
+    csscompressor = None
+
+# brotli es opcional: variante Brotli precomprimida de la hoja de estilos
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# numba es opcional: si no está instalado se usa Python puro
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Rutas sin estado (API JSON y estáticos): no leen la sesión ni mensajes flash
+SESSIONLESS_PREFIXES = ('/api/', '/evaluate/', '/reports/data', '/static/', '/assets/')
+
+class SessionInterface(SecureCookieSessionInterface):
+    """Sesión en cookie firmada que no se verifica en las rutas sin estado"""
+    def open_session(self, app, request):
+        if request.path.startswith(SESSIONLESS_PREFIXES):
+            return self.make_null_session(app)
+        return super().open_session(app, request)
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'hotmart_credit_sim_secret_key_2025')
+app.session_interface = SessionInterface()
+# Plantillas compiladas una vez y reutilizadas; recarga solo si se pide explícitamente
+app.config['TEMPLATES_AUTO_RELOAD'] = os.getenv('TEMPLATES_AUTO_RELOAD') == '1'
+# Sin saltos de línea ni sangría de las etiquetas de bloque en el HTML generado
+app.jinja_env.trim_blocks = True
+app.jinja_env.lstrip_blocks = True
+# Caché en disco del bytecode de las plantillas: los workers nuevos no recompilan.
+# Sin JINJA_CACHE_DIR, Jinja usa un directorio privado del usuario en /tmp. La clave
+# de Jinja no incluye las opciones anteriores, por eso van marcadas en el patrón
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(os.getenv('JINJA_CACHE_DIR') or None,
+                                                       '__jinja2_%s.trim.cache')
+# Compresión de respuestas (texto, JSON, CSS) si Flask-Compress está instalado
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+# Las páginas transmitidas usan su propia lista (por defecto zstd, br, deflate);
+# gzip no admite compresión incremental en Flask-Compress, deflate ocupa su lugar
+app.config['COMPRESS_ALGORITHM_STREAMING'] = ['br', 'deflate']
+app.config['COMPRESS_LEVEL'] = 5
+app.config['COMPRESS_BR_LEVEL'] = 5
+app.config['COMPRESS_MIN_SIZE'] = 500
+if Compress is not None:
+    Compress(app)
+MINIFY_HTML = htmlmin is not None and os.getenv('MINIFY_HTML') == '1'
+# Estáticos con caché de un año; la URL lleva un hash del contenido para invalidarla
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
+with open(os.path.join(app.static_folder, 'app.css'), 'rb') as _css:
+    _APP_CSS = _css.read()
+app.jinja_env.globals['static_version'] = hashlib.md5(_APP_CSS).hexdigest()[:8]
+# Hoja de estilos servida: minificada si hay csscompressor y precomprimida una sola
+# vez por proceso; cada petición solo elige la codificación
+STYLESHEET = (csscompressor.compress(_APP_CSS.decode('utf-8')).encode('utf-8')
+              if csscompressor is not None else _APP_CSS)
+
+def _precompress(body):
+    """Versiones comprimidas de un cuerpo fijo, por codificación.
+    
+    En orden de preferencia: ante igual calidad en Accept-Encoding gana la primera.
+    """
+    encodings = {}
+    if brotli is not None:
+        encodings['br'] = brotli.compress(body, quality=11)
+    encodings['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+    return encodings
 
-# Clave de acceso al módulo de administración
-ADMIN_ACCESS_KEY = "RAG123"
+STYLESHEET_ENCODINGS = _precompress(STYLESHEET)
 
-# Lista para almacenar simulaciones de la sesión (máximo 10)
-session_simulations = []
+# Huella SHA-256 de la clave de acceso al módulo de administración (configurable por entorno)
+ADMIN_ACCESS_HASH = hashlib.sha256(os.getenv('ADMIN_ACCESS_KEY', 'RAG123').encode('utf-8')).digest()
+
+# Duración máxima de la sesión administrativa
+app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(
+    minutes=int(os.getenv('ADMIN_SESSION_MINUTES', '60')))
+
+# Simulaciones de la sesión (máximo 10, la más reciente primero)
+SIMULATION_LIMIT = 10
+session_simulations = deque(maxlen=SIMULATION_LIMIT)
+_simulations_lock = threading.Lock()
+
+# Columnas numéricas de las simulaciones (SoA) para agregar con NumPy.
+# Anillo paralelo al deque: la ranura más antigua se sobrescribe; 'used'
+# marca las ranuras ocupadas. Los textos quedan en los registros del deque.
+PROFILE_IDS = {'AAA': 0, 'AA': 1, 'A': 2, 'BBB': 3, 'BB': 4, 'B': 5, 'RECHAZADO': 6}
+PROFILE_CODES = tuple(PROFILE_IDS)
+SIMULATION_DTYPE = np.dtype([
+    ('amount', 'f8'), ('rate', 'f8'), ('profile_id', 'u1'), ('approved', '?'),
+    ('age', 'f8'), ('score', 'f8'), ('income', 'f8'), ('tenure', 'f8'), ('used', '?')
+])
+_simulation_columns = np.zeros(SIMULATION_LIMIT, dtype=SIMULATION_DTYPE)
+_simulation_slot = 0
+# Contadores de rechazos mantenidos al insertar y desalojar ranuras:
+# [rechazos, score < 650, ingresos < 15000, antigüedad < 1 año]
+_rejection_counts = [0, 0, 0, 0]
+# Versión de las simulaciones: cambia con cada alta o limpieza
+_simulations_version = 0
+# Prefijo del ETag de /reports: distingue versiones de procesos distintos
+_REPORTS_ETAG_PREFIX = f'reports-{time.time_ns():x}'
+# Prefijo del ETag de /admin: la página cambia con el despliegue aunque no cambien las reglas
+_ADMIN_ETAG_PREFIX = f'admin-{time.time_ns():x}'
+# Fragmentos HTML del dashboard renderizados para una versión: (versión, dict)
+_reports_fragments = (None, None)
+
+# Protege las mutaciones de business_rules (reentrante: load -> save)
+_rules_lock = threading.RLock()
+
+@dataclass(slots=True)
+class SimulationRecord:
+    """Registro de una simulación mostrado en el dashboard de reportes"""
+    ts: float  # epoch; se formatea al renderizar con el filtro humantime
+    nombre: str
+    edad: int
+    score_crediticio: int
+    ingresos_mensuales: float
+    antiguedad_laboral: int
+    deudas_actuales: float
+    monto_solicitado: float
+    proposito: str
+    resultado: dict
+    aprobado: bool
+    perfil: str
+    monto_aprobado: float
+    tasa_anual: float
+    plazo_meses: int
+    pago_mensual: float
+    motivo_rechazo: str
 
 # Configuración de reglas de negocio por defecto
-DEFAULT_RULES = {
+def _freeze(value):
+    """Convierte dicts anidados en vistas de solo lectura"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+def _thaw(value):
+    """Copia profunda mutable de una estructura congelada con _freeze"""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    return value
+
+DEFAULT_RULES = _freeze({
     "score_minimo": 650,
     "edad_minima": 18,
     "edad_maxima": 70,
@@ -41,101 +224,421 @@ DEFAULT_RULES = {
         "A": {"min": 12, "max": 36}, "BBB": {"min": 12, "max": 24},
         "BB": {"min": 6, "max": 18}, "B": {"min": 6, "max": 12}
     }
-}
+})
+
+def default_rules():
+    """Devuelve una copia independiente y mutable de las reglas por defecto"""
+    return _thaw(DEFAULT_RULES)
 
-business_rules = DEFAULT_RULES.copy()
+business_rules = default_rules()
+
+# Perfiles configurables, de menor a mayor riesgo
+PERFILES = ('AAA', 'AA', 'A', 'BBB', 'BB', 'B')
+
+@dataclass(frozen=True)
+class RulesSnapshot:
+    """Reglas vigentes y todo lo que se deriva de ellas, publicado en una sola asignación.
+    
+    Las evaluaciones toman una instantánea y trabajan solo con ella: nunca mezclan
+    reglas de una generación con tablas de otra. Se compara y se hashea solo por
+    la generación, que es la clave de la caché de evaluaciones.
+    """
+    generation: int
+    rules: dict = field(compare=False)
+    # perfil -> (monto_max, tasa_min, tasa_max, descuento_por_punto, plazo_max)
+    profile_lut: dict = field(compare=False)
+    # Mismos parámetros como arreglos indexados por posición en PROFILE_TABLE, para
+    # la evaluación por lotes; la fila de RECHAZADO es neutra (nunca genera oferta)
+    profile_arrays: tuple = field(compare=False)
+    # Valores por perfil tal como los muestra el formulario de admin
+    admin_profiles: tuple = field(compare=False)
+    # Reglas serializadas para /api/rules y su ETag
+    rules_json: bytes = field(compare=False)
+    rules_etag: str = field(compare=False)
+
+def _profile_tables(rules):
+    """Tablas por perfil (LUT, arreglos, filas del admin) de unas reglas"""
+    montos = rules['monto_maximo_por_perfil']
+    tasas = rules['tasas_por_perfil']
+    plazos = rules['plazos_por_perfil']
+    # La tasa baja linealmente con el score interno (0-100): descuento por punto precalculado
+    lut = {
+        p: (montos[p], tasas[p]['min'], tasas[p]['max'],
+            (tasas[p]['max'] - tasas[p]['min']) / 100, plazos[p]['max'])
+        for p in PERFILES
+    }
+    rows = [(0, 0.0, 0.0, 0.0, 1)] + [lut[p] for p in PROFILE_TABLE[1:]]
+    arrays = tuple(np.array(column) for column in zip(*rows))
+    admin_profiles = tuple(
+        {'code': p, 'monto': montos[p], 'tasa_min': tasas[p]['min'],
+         'tasa_max': tasas[p]['max'], 'plazo_max': plazos[p]['max']}
+        for p in PERFILES
+    )
+    return lut, arrays, admin_profiles
+
+# Instantánea vigente; la generación 0 es la de antes de cargar las reglas
+_rules_snapshot = RulesSnapshot(0, {}, {}, (), (), b'{}', '')
+
+def _dump_rules(rules, sort_keys=False, indent=False):
+    """Serializa reglas a JSON (bytes) con orjson o, si no está, con json estándar"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(rules, option=option)
+        except TypeError:
+            # Enteros de más de 64 bits: solo json estándar los admite
+            pass
+    return json.dumps(rules, sort_keys=sort_keys, indent=2 if indent else None,
+                      ensure_ascii=False).encode('utf-8')
+
+def _refresh_derived_rules():
+    """Recalcula todo lo que se deriva de business_rules tras un cambio"""
+    global _rules_snapshot
+    rules = business_rules
+    # Todo se calcula antes de publicar: si algo falla sigue vigente la instantánea anterior
+    lut, arrays, admin_profiles = _profile_tables(rules)
+    body = _dump_rules(rules, sort_keys=True)
+    # Una sola asignación: la nueva generación (y su caché) llega junto con sus tablas
+    _rules_snapshot = RulesSnapshot(_rules_snapshot.generation + 1, rules, lut, arrays,
+                                    admin_profiles, body, hashlib.md5(body).hexdigest())
+
+# Caché de reglas parseadas, indexada por el mtime del archivo
+_rules_cache = {'mtime': None, 'data': None}
 
 def load_business_rules():
     """Carga las reglas de negocio desde archivo o usa las por defecto"""
+    global business_rules
+    with _rules_lock:
+        previous = business_rules
+        _load_business_rules()
+        if business_rules is not previous:
+            try:
+                _refresh_derived_rules()
+            except Exception as e:
+                print(f"⚠ Reglas inválidas: {e}. Usando reglas por defecto.")
+                business_rules = default_rules()
+                # El archivo sin cambios no se vuelve a intentar en cada carga
+                _rules_cache['data'] = business_rules
+                _refresh_derived_rules()
+
+def _merge_rules(base, loaded):
+    """Superpone las reglas leídas sobre base; los dicts anidados se mezclan clave a clave"""
+    for key, value in loaded.items():
+        current = base.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            _merge_rules(current, value)
+        else:
+            base[key] = value
+
+def _load_business_rules():
     global business_rules
     rules_file = 'business_rules.json'
     
     if os.path.exists(rules_file):
+        mtime = None
         try:
-            with open(rules_file, 'r', encoding='utf-8') as f:
-                loaded_rules = json.load(f)
-                business_rules = DEFAULT_RULES.copy()
-                for key, value in loaded_rules.items():
-                    if key in business_rules:
-                        if isinstance(business_rules[key], dict):
-                            business_rules[key].update(value)
-                        else:
-                            business_rules[key] = value
+            mtime = os.stat(rules_file).st_mtime_ns
+            if mtime == _rules_cache['mtime']:
+                # Archivo sin cambios: reutilizar las reglas ya parseadas
+                business_rules = _rules_cache['data']
+                return
+            with open(rules_file, 'rb') as f:
+                raw = f.read()
+            loaded_rules = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            business_rules = default_rules()
+            # Solo claves conocidas; un perfil parcial conserva los valores por defecto que falten
+            _merge_rules(business_rules, {key: value for key, value in loaded_rules.items()
+                                          if key in business_rules})
+            _rules_cache['mtime'] = mtime
+            _rules_cache['data'] = business_rules
             print("✓ Reglas de negocio cargadas desde archivo")
         except Exception as e:
             print(f"⚠ Error cargando reglas: {e}. Usando reglas por defecto.")
-            business_rules = DEFAULT_RULES.copy()
+            business_rules = default_rules()
+            if mtime is not None:
+                # Un archivo inválido se reporta una vez: no se relee hasta que cambie
+                _rules_cache['mtime'] = mtime
+                _rules_cache['data'] = business_rules
     else:
-        business_rules = DEFAULT_RULES.copy()
+        business_rules = default_rules()
         save_business_rules()
 
 def save_business_rules():
-    """Guarda las reglas de negocio en archivo"""
+    """Guarda las reglas de negocio en archivo; devuelve False si no se pudo"""
     rules_file = 'business_rules.json'
     try:
-        with open(rules_file, 'w', encoding='utf-8') as f:
-            json.dump(business_rules, f, indent=2, ensure_ascii=False)
+        with _rules_lock:
+            _refresh_derived_rules()
+            data = _dump_rules(business_rules, indent=True)
+            # Escribir en un temporal y renombrar: el archivo nunca queda a medias
+            tmp_file = rules_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, rules_file)
+            # Las reglas en memoria ya son las del archivo: evitar re-parsearlo
+            _rules_cache['mtime'] = os.stat(rules_file).st_mtime_ns
+            _rules_cache['data'] = business_rules
         print("✓ Reglas de negocio guardadas")
+        return True
     except Exception as e:
         print(f"⚠ Error guardando reglas: {e}")
+        return False
+
+def replace_business_rules(new_rules):
+    """Publica un dict de reglas completo y lo guarda (copy-on-write).
+    
+    Si no se pueden guardar en el archivo se mantienen las anteriores y
+    devuelve False.
+    """
+    global business_rules
+    with _rules_lock:
+        previous = business_rules
+        # Las evaluaciones en curso siguen leyendo el dict anterior, que ya no cambia
+        business_rules = new_rules
+        if save_business_rules():
+            return True
+        # Memoria y archivo deben coincidir: la próxima recarga leería el archivo
+        business_rules = previous
+        _refresh_derived_rules()
+        return False
+
+def _rejection_flags(row):
+    """Aporte de una ranura del anillo a _rejection_counts"""
+    if not row['used'] or row['approved']:
+        return (0, 0, 0, 0)
+    return (1, int(row['score'] < 650), int(row['income'] < 15000), int(row['tenure'] < 1))
+
+def _f8(value):
+    """Valor para una columna f8; los enteros fuera del rango de float se saturan a ±inf"""
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
 
 def add_simulation_to_session(simulation_data):
     """Añade una simulación a la lista de la sesión (máximo 10)"""
-    global session_simulations
+    # Extraer una sola vez las secciones anidadas del resultado
+    resultado = simulation_data.get('resultado') or {}
+    oferta = resultado.get('oferta_credito') or {}
+    perfil_info = resultado.get('perfil_riesgo') or {}
+    aprobado = resultado.get('aprobado', False)
     
-    # Preparar datos de la simulación
-    sim_record = {
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "nombre": simulation_data.get('nombre', 'N/A'),
-        "edad": simulation_data.get('edad', 0),
-        "score_crediticio": simulation_data.get('score_crediticio', 0),
-        "ingresos_mensuales": simulation_data.get('ingresos_mensuales', 0),
-        "antiguedad_laboral": simulation_data.get('antiguedad_laboral', 0),
-        "deudas_actuales": simulation_data.get('deudas_actuales', 0),
-        "monto_solicitado": simulation_data.get('monto_solicitado', 0) or 0,
-        "proposito": simulation_data.get('proposito', 'personal'),
-        "resultado": simulation_data.get('resultado', {}),
-        "aprobado": simulation_data.get('resultado', {}).get('aprobado', False),
-        "perfil": simulation_data.get('resultado', {}).get('perfil_riesgo', {}).get('perfil', 'RECHAZADO'),
-        "monto_aprobado": simulation_data.get('resultado', {}).get('oferta_credito', {}).get('monto_aprobado', 0) if simulation_data.get('resultado', {}).get('oferta_credito') else 0,
-        "tasa_anual": simulation_data.get('resultado', {}).get('oferta_credito', {}).get('tasa_anual', 0) if simulation_data.get('resultado', {}).get('oferta_credito') else 0,
-        "plazo_meses": simulation_data.get('resultado', {}).get('oferta_credito', {}).get('plazo_meses', 0) if simulation_data.get('resultado', {}).get('oferta_credito') else 0,
-        "pago_mensual": simulation_data.get('resultado', {}).get('oferta_credito', {}).get('pago_mensual', 0) if simulation_data.get('resultado', {}).get('oferta_credito') else 0,
-        "motivo_rechazo": simulation_data.get('resultado', {}).get('motivo_rechazo', '') if not simulation_data.get('resultado', {}).get('aprobado', False) else ''
-    }
+    # Preparar datos de la simulación (orden de campos de SimulationRecord)
+    sim_record = SimulationRecord(
+        time.time(),
+        simulation_data.get('nombre', 'N/A'),
+        simulation_data.get('edad', 0),
+        simulation_data.get('score_crediticio', 0),
+        simulation_data.get('ingresos_mensuales', 0),
+        simulation_data.get('antiguedad_laboral', 0),
+        simulation_data.get('deudas_actuales', 0),
+        simulation_data.get('monto_solicitado', 0) or 0,
+        simulation_data.get('proposito', 'personal'),
+        resultado,
+        aprobado,
+        perfil_info.get('perfil', 'RECHAZADO'),
+        oferta.get('monto_aprobado', 0),
+        oferta.get('tasa_anual', 0),
+        oferta.get('plazo_meses', 0),
+        oferta.get('pago_mensual', 0),
+        '' if aprobado else resultado.get('motivo_rechazo', ''),
+    )
     
-    # Añadir al principio de la lista
-    session_simulations.insert(0, sim_record)
+    # La fila del anillo se arma antes de tocar el deque: si un valor no cabe en
+    # las columnas la simulación no se registra y ambas estructuras siguen alineadas
+    try:
+        row = np.array((
+            _f8(sim_record.monto_aprobado),
+            _f8(sim_record.tasa_anual),
+            PROFILE_IDS.get(sim_record.perfil, PROFILE_IDS['RECHAZADO']),
+            sim_record.aprobado,
+            _f8(sim_record.edad),
+            _f8(sim_record.score_crediticio),
+            _f8(sim_record.ingresos_mensuales),
+            _f8(sim_record.antiguedad_laboral),
+            True,
+        ), dtype=SIMULATION_DTYPE)
+    except (TypeError, ValueError) as e:
+        print(f"⚠ Simulación no registrada: {e}")
+        return
     
-    # Mantener máximo 10 simulaciones
-    if len(session_simulations) > 10:
-        session_simulations = session_simulations[:10]
+    # Añadir al principio; el deque descarta la más antigua al superar el máximo
+    global _simulation_slot, _simulations_version
+    with _simulations_lock:
+        slot = _simulation_columns[_simulation_slot]
+        evicted = _rejection_flags(slot)
+        _simulation_columns[_simulation_slot] = row
+        session_simulations.appendleft(sim_record)
+        added = _rejection_flags(slot)
+        for i in range(len(_rejection_counts)):
+            _rejection_counts[i] += added[i] - evicted[i]
+        _simulation_slot = (_simulation_slot + 1) % SIMULATION_LIMIT
+        _simulations_version += 1
 
+@app.template_global()
 def validate_rules(rules):
     """Valida la consistencia de las reglas de negocio"""
+    key = (rules['edad_minima'], rules['edad_maxima'], rules['ratio_deuda_ingreso_maximo'],
+           tuple((perfil, tasas['min'], tasas['max']) for perfil, tasas in rules['tasas_por_perfil'].items()))
+    return _validate_rules_frozen(key)
+
+@lru_cache(maxsize=8)
+def _validate_rules_frozen(key):
+    """Validación sobre una instantánea inmutable de los campos relevantes"""
+    edad_minima, edad_maxima, ratio_maximo, tasas_por_perfil = key
     validation_results = []
     
-    if rules['edad_minima'] < rules['edad_maxima']:
+    if edad_minima < edad_maxima:
         validation_results.append("✓ Rango de edad válido")
     else:
         validation_results.append("❌ Rango de edad inválido")
     
-    if 0 < rules['ratio_deuda_ingreso_maximo'] <= 1:
+    if 0 < ratio_maximo <= 1:
         validation_results.append("✓ Ratio deuda-ingreso válido")
     else:
         validation_results.append("❌ Ratio deuda-ingreso inválido")
     
-    for perfil, tasas in rules['tasas_por_perfil'].items():
-        if tasas['min'] < tasas['max']:
+    for perfil, tasa_min, tasa_max in tasas_por_perfil:
+        if tasa_min < tasa_max:
             validation_results.append(f"✓ Tasas {perfil} válidas")
         else:
             validation_results.append(f"❌ Tasas {perfil} inválidas")
     
-    return validation_results
+    # Tupla: el resultado se comparte entre llamadas y no debe mutarse
+    return tuple(validation_results)
+
+# Tablas de puntuación del perfil de riesgo: umbrales ordenados y
+# (puntos, factor) por tramo, consultados con bisect. Los textos de factor
+# se internan al importar y cada evaluación reutiliza los mismos objetos
+def _interned(table):
+    return tuple((points, sys.intern(factor)) for points, factor in table)
+
+SCORE_THRESHOLDS = (600, 650, 700, 750, 800)
+SCORE_TABLE = _interned((
+    (5, "Score muy bajo (<600)"),
+    (10, "Score bajo (600-649)"),
+    (20, "Score regular (650-699)"),
+    (30, "Score bueno (700-749)"),
+    (35, "Score muy bueno (750-799)"),
+    (40, "Score excelente (800+)"),
+))
+
+INCOME_THRESHOLDS = (15000, 20000, 30000, 50000)
+INCOME_TABLE = _interned((
+    (2, "Ingresos bajos (<$15k)"),
+    (10, "Ingresos básicos ($15k-$20k)"),
+    (15, "Ingresos medios ($20k-$30k)"),
+    (20, "Ingresos buenos ($30k-$50k)"),
+    (25, "Ingresos altos ($50k+)"),
+))
+
+TENURE_THRESHOLDS = (1, 2, 3, 5)
+TENURE_TABLE = _interned((
+    (2, "Antigüedad insuficiente (<1 año)"),
+    (7, "Antigüedad mínima (1-2 años)"),
+    (10, "Antigüedad regular (2-3 años)"),
+    (12, "Antigüedad buena (3-5 años)"),
+    (15, "Antigüedad excelente (5+ años)"),
+))
+
+DTI_THRESHOLDS = (0.10, 0.20, 0.30, 0.35)
+DTI_TABLE = _interned((
+    (10, "Endeudamiento muy bajo (<10%)"),
+    (8, "Endeudamiento bajo (10-20%)"),
+    (6, "Endeudamiento moderado (20-30%)"),
+    (3, "Endeudamiento alto (30-35%)"),
+    (1, "Endeudamiento excesivo (>35%)"),
+))
+
+def _age_factor(edad):
+    if 35 <= edad <= 50:
+        return (10, "Edad óptima (35-50)")
+    elif 25 <= edad < 35 or 50 < edad <= 60:
+        return (8, "Edad favorable")
+    elif 18 <= edad < 25 or 60 < edad <= 65:
+        return (5, "Edad aceptable")
+    return (1, "Edad de riesgo")
+
+# Edad -> (puntos, factor), indexada por min(edad, 100)
+AGE_LUT = _interned(_age_factor(edad) for edad in range(101))
+
+PROFILE_THRESHOLDS = (35, 45, 55, 65, 75, 85)
+PROFILE_TABLE = ("RECHAZADO", "B", "BB", "BBB", "A", "AA", "AAA")
+
+# Tope de plazo (meses) según el monto ofrecido; límites inclusivos (monto <= umbral).
+# El último tramo no tiene tope propio: se usa el plazo máximo del perfil.
+TERM_THRESHOLDS = (50000, 100000)
+TERM_CAPS = (24, 36, sys.maxsize)
+
+# Puntos de cada tabla como arreglos para la evaluación por lotes (np.digitize)
+SCORE_POINTS = np.array([pts for pts, _ in SCORE_TABLE])
+INCOME_POINTS = np.array([pts for pts, _ in INCOME_TABLE])
+TENURE_POINTS = np.array([pts for pts, _ in TENURE_TABLE])
+AGE_POINTS = np.array([pts for pts, _ in AGE_LUT])
+DTI_POINTS = np.array([pts for pts, _ in DTI_TABLE])
+TERM_CAPS_ARRAY = np.array(TERM_CAPS)
+
+# Umbrales como arreglos, convertidos una sola vez y no en cada lote
+SCORE_BINS = np.array(SCORE_THRESHOLDS)
+INCOME_BINS = np.array(INCOME_THRESHOLDS)
+TENURE_BINS = np.array(TENURE_THRESHOLDS)
+DTI_BINS = np.array(DTI_THRESHOLDS)
+PROFILE_BINS = np.array(PROFILE_THRESHOLDS)
+TERM_BINS = np.array(TERM_THRESHOLDS)
+
+@njit(cache=True)
+def _amortization(monto, tasa_anual, plazo_meses):
+    """Pago mensual, total a pagar e intereses de un crédito amortizable"""
+    tasa_mensual = tasa_anual / 100 / 12
+    if tasa_mensual > 0:
+        # (1 + i)^n - 1 vía expm1/log1p: estable aun con tasas muy pequeñas
+        crecimiento = math.expm1(plazo_meses * math.log1p(tasa_mensual))
+        pago_mensual = monto * tasa_mensual * (crecimiento + 1) / crecimiento
+    else:
+        pago_mensual = monto / plazo_meses
+    total = pago_mensual * plazo_meses
+    return pago_mensual, total, total - monto
+
+@njit(cache=True)
+def _amortization_array(montos, tasas_anuales, plazos_meses):
+    """Versión vectorizada de _amortization para arreglos float64"""
+    tasas_mensuales = tasas_anuales / 100 / 12
+    con_interes = tasas_mensuales > 0
+    crecimientos = np.expm1(plazos_meses * np.log1p(tasas_mensuales))
+    # El denominador neutro evita dividir por cero en las filas sin interés
+    divisores = np.where(con_interes, crecimientos, 1.0)
+    pagos = np.where(con_interes,
+                     montos * tasas_mensuales * (crecimientos + 1) / divisores,
+                     montos / plazos_meses)
+    totales = pagos * plazos_meses
+    return pagos, totales, totales - montos
+
+# Compilar al importar para que la primera solicitud no pague el JIT
+_amortization(1000.0, 12.0, 12.0)
+_amortization_array(np.array([1000.0]), np.array([12.0]), np.array([12.0]))
+
+# Fecha ISO del segundo actual; se formatea una vez por segundo, no por solicitud
+_iso_cache = (0, '')
+
+def _now_iso():
+    """Devuelve la fecha y hora local actual en ISO, con precisión de segundos"""
+    global _iso_cache
+    now = int(time.time())
+    cached = _iso_cache
+    if cached[0] != now:
+        cached = (now, datetime.fromtimestamp(now).isoformat())
+        _iso_cache = cached
+    return cached[1]
 
 class CreditEvaluator:
-    def __init__(self):
-        self.rules = business_rules
+    @property
+    def rules(self):
+        """Reglas de negocio vigentes (las de la instantánea publicada)"""
+        return _rules_snapshot.rules
     
     def calculate_risk_profile(self, data):
         """Calcula el perfil de riesgo basado en múltiples factores"""
@@ -144,109 +647,38 @@ class CreditEvaluator:
         
         # Factor Score Crediticio (40% del peso)
         score_credit = int(data.get('score_crediticio', 0))
-        if score_credit >= 800:
-            score += 40
-            factors.append("Score excelente (800+)")
-        elif score_credit >= 750:
-            score += 35
-            factors.append("Score muy bueno (750-799)")
-        elif score_credit >= 700:
-            score += 30
-            factors.append("Score bueno (700-749)")
-        elif score_credit >= 650:
-            score += 20
-            factors.append("Score regular (650-699)")
-        elif score_credit >= 600:
-            score += 10
-            factors.append("Score bajo (600-649)")
-        else:
-            score += 5
-            factors.append("Score muy bajo (<600)")
+        pts, factor = SCORE_TABLE[bisect_right(SCORE_THRESHOLDS, score_credit)]
+        score += pts
+        factors.append(factor)
         
         # Factor Ingresos (25% del peso)
         ingresos = float(data.get('ingresos_mensuales', 0))
-        if ingresos >= 50000:
-            score += 25
-            factors.append("Ingresos altos ($50k+)")
-        elif ingresos >= 30000:
-            score += 20
-            factors.append("Ingresos buenos ($30k-$50k)")
-        elif ingresos >= 20000:
-            score += 15
-            factors.append("Ingresos medios ($20k-$30k)")
-        elif ingresos >= 15000:
-            score += 10
-            factors.append("Ingresos básicos ($15k-$20k)")
-        else:
-            score += 2
-            factors.append("Ingresos bajos (<$15k)")
+        pts, factor = INCOME_TABLE[bisect_right(INCOME_THRESHOLDS, ingresos)]
+        score += pts
+        factors.append(factor)
 
         # Factor Antigüedad Laboral (15% del peso) - EN AÑOS
         antiguedad_anos = int(data.get('antiguedad_laboral', 0))
-        if antiguedad_anos >= 5:
-            score += 15
-            factors.append("Antigüedad excelente (5+ años)")
-        elif antiguedad_anos >= 3:
-            score += 12
-            factors.append("Antigüedad buena (3-5 años)")
-        elif antiguedad_anos >= 2:
-            score += 10
-            factors.append("Antigüedad regular (2-3 años)")
-        elif antiguedad_anos >= 1:
-            score += 7
-            factors.append("Antigüedad mínima (1-2 años)")
-        else:
-            score += 2
-            factors.append("Antigüedad insuficiente (<1 año)")
+        pts, factor = TENURE_TABLE[bisect_right(TENURE_THRESHOLDS, antiguedad_anos)]
+        score += pts
+        factors.append(factor)
 
         # Factor Edad (10% del peso)
         edad = int(data.get('edad', 0))
-        if 35 <= edad <= 50:
-            score += 10
-            factors.append("Edad óptima (35-50)")
-        elif 25 <= edad < 35 or 50 < edad <= 60:
-            score += 8
-            factors.append("Edad favorable")
-        elif 18 <= edad < 25 or 60 < edad <= 65:
-            score += 5
-            factors.append("Edad aceptable")
-        else:
-            score += 1
-            factors.append("Edad de riesgo")
+        pts, factor = AGE_LUT[max(0, min(edad, 100))]
+        score += pts
+        factors.append(factor)
 
         # Factor Ratio Deuda-Ingreso (10% del peso)
         deudas = float(data.get('deudas_actuales', 0))
         ratio_deuda = deudas / ingresos if ingresos > 0 else 1
-        if ratio_deuda <= 0.10:
-            score += 10
-            factors.append("Endeudamiento muy bajo (<10%)")
-        elif ratio_deuda <= 0.20:
-            score += 8
-            factors.append("Endeudamiento bajo (10-20%)")
-        elif ratio_deuda <= 0.30:
-            score += 6
-            factors.append("Endeudamiento moderado (20-30%)")
-        elif ratio_deuda <= 0.35:
-            score += 3
-            factors.append("Endeudamiento alto (30-35%)")
-        else:
-            score += 1
-            factors.append("Endeudamiento excesivo (>35%)")
+        # bisect_left: los límites son inclusivos (ratio <= umbral)
+        pts, factor = DTI_TABLE[bisect_left(DTI_THRESHOLDS, ratio_deuda)]
+        score += pts
+        factors.append(factor)
         
         # Determinar perfil basado en score total
-        profile = "RECHAZADO"
-        if score >= 85:
-            profile = "AAA"
-        elif score >= 75:
-            profile = "AA"
-        elif score >= 65:
-            profile = "A"
-        elif score >= 55:
-            profile = "BBB"
-        elif score >= 45:
-            profile = "BB"
-        elif score >= 35:
-            profile = "B"
+        profile = PROFILE_TABLE[bisect_right(PROFILE_THRESHOLDS, score)]
         
         return {
             "perfil": profile,
@@ -255,83 +687,90 @@ class CreditEvaluator:
             "ratio_deuda_ingreso": ratio_deuda
         }
     
-    def validate_basic_requirements(self, data):
+    def validate_basic_requirements(self, data, rules=None):
         """Valida los requisitos básicos según las reglas de negocio"""
+        rules = self.rules if rules is None else rules
         errors = []
         warnings = []
         
         score_crediticio = int(data.get('score_crediticio', 0))
-        if score_crediticio < self.rules['score_minimo']:
-            errors.append(f"Score crediticio insuficiente: {score_crediticio} < {self.rules['score_minimo']}")
+        if score_crediticio < rules['score_minimo']:
+            errors.append(f"Score crediticio insuficiente: {score_crediticio} < {rules['score_minimo']}")
         
         edad = int(data.get('edad', 0))
-        if not self.rules['edad_minima'] <= edad <= self.rules['edad_maxima']:
-            errors.append(f"Edad fuera del rango: {edad} (permitido: {self.rules['edad_minima']}-{self.rules['edad_maxima']})")
+        if not rules['edad_minima'] <= edad <= rules['edad_maxima']:
+            errors.append(f"Edad fuera del rango: {edad} (permitido: {rules['edad_minima']}-{rules['edad_maxima']})")
         
         ingresos = float(data.get('ingresos_mensuales', 0))
-        if ingresos < self.rules['ingresos_minimos']:
-            errors.append(f"Ingresos insuficientes: ${ingresos:,.0f} < ${self.rules['ingresos_minimos']:,.0f}")
+        if ingresos < rules['ingresos_minimos']:
+            errors.append(f"Ingresos insuficientes: ${ingresos:,.0f} < ${rules['ingresos_minimos']:,.0f}")
         
         # Validación en años
         antiguedad_anos = int(data.get('antiguedad_laboral', 0))
-        if antiguedad_anos < self.rules['antiguedad_laboral_minima']:
-            errors.append(f"Antigüedad laboral insuficiente: {antiguedad_anos} años < {self.rules['antiguedad_laboral_minima']} años")
+        if antiguedad_anos < rules['antiguedad_laboral_minima']:
+            errors.append(f"Antigüedad laboral insuficiente: {antiguedad_anos} años < {rules['antiguedad_laboral_minima']} años")
         
         deudas = float(data.get('deudas_actuales', 0))
         ratio_deuda = deudas / ingresos if ingresos > 0 else 1
-        if ratio_deuda > self.rules['ratio_deuda_ingreso_maximo']:
-            errors.append(f"Ratio deuda-ingreso excesivo: {ratio_deuda:.2%} > {self.rules['ratio_deuda_ingreso_maximo']:.2%}")
+        if ratio_deuda > rules['ratio_deuda_ingreso_maximo']:
+            errors.append(f"Ratio deuda-ingreso excesivo: {ratio_deuda:.2%} > {rules['ratio_deuda_ingreso_maximo']:.2%}")
         
         return errors, warnings
     
-    def calculate_credit_offer(self, profile_data, monto_solicitado=None):
+    def calculate_credit_offer(self, profile_data, monto_solicitado=None, snapshot=None):
         """Calcula la oferta de crédito basada en el perfil"""
         profile = profile_data['perfil']
         if profile == "RECHAZADO":
             return None
         
-        monto_maximo = self.rules['monto_maximo_por_perfil'][profile]
-        tasa_info = self.rules['tasas_por_perfil'][profile]
-        plazo_info = self.rules['plazos_por_perfil'][profile]
+        snapshot = _rules_snapshot if snapshot is None else snapshot
+        monto_maximo, tasa_min, tasa_max, tasa_por_punto, plazo_max = snapshot.profile_lut[profile]
         
         monto_ofrecido = monto_maximo
         if monto_solicitado and monto_solicitado <= monto_maximo:
             monto_ofrecido = monto_solicitado
         
         # Calcular tasa basada en el score interno
-        score_ratio = profile_data['score_total'] / 100
-        tasa_range = tasa_info['max'] - tasa_info['min']
-        tasa_anual = tasa_info['max'] - (score_ratio * tasa_range)
-        tasa_anual = max(tasa_info['min'], min(tasa_info['max'], tasa_anual))
+        tasa_anual = tasa_max - profile_data['score_total'] * tasa_por_punto
+        # El recorte solo actúa si las reglas traen un mínimo mayor que el máximo
+        tasa_anual = max(tasa_min, min(tasa_max, tasa_anual))
         
         # Plazo recomendado basado en monto y perfil
-        if monto_ofrecido <= 50000:
-            plazo_meses = min(24, plazo_info['max'])
-        elif monto_ofrecido <= 100000:
-            plazo_meses = min(36, plazo_info['max'])
-        else:
-            plazo_meses = plazo_info['max']
+        plazo_meses = min(TERM_CAPS[bisect_left(TERM_THRESHOLDS, monto_ofrecido)], plazo_max)
         
         # Calcular pago mensual
-        tasa_mensual = tasa_anual / 100 / 12
-        if tasa_mensual > 0:
-            pago_mensual = monto_ofrecido * (tasa_mensual * (1 + tasa_mensual) ** plazo_meses) / ((1 + tasa_mensual) ** plazo_meses - 1)
-        else:
-            pago_mensual = monto_ofrecido / plazo_meses
+        pago_mensual, total_a_pagar, intereses = _amortization(
+            float(monto_ofrecido), float(tasa_anual), float(plazo_meses))
         
         return {
             "monto_aprobado": round(monto_ofrecido, 2),
             "tasa_anual": round(tasa_anual, 2),
             "plazo_meses": plazo_meses,
             "pago_mensual": round(pago_mensual, 2),
-            "total_a_pagar": round(pago_mensual * plazo_meses, 2),
-            "intereses_totales": round((pago_mensual * plazo_meses) - monto_ofrecido, 2)
+            "total_a_pagar": round(total_a_pagar, 2),
+            "intereses_totales": round(intereses, 2)
         }
     
     def evaluate_credit_request(self, data):
-        """Evaluación completa de solicitud de crédito"""
+        """Evaluación completa de solicitud de crédito, memoizada por datos y reglas vigentes"""
+        # Toda la evaluación usa la misma instantánea, también como clave de la caché
+        snapshot = _rules_snapshot
+        try:
+            key = tuple(data.get(field, _MISSING) for field in EVALUATION_FIELDS)
+            resultado = _evaluate_cached(key, snapshot)
+        except (TypeError, AttributeError):
+            # Datos que no son un dict o con valores no hashables: evaluar sin caché
+            return self._evaluate(data, snapshot)
+        # Copia superficial: el resultado en caché se comparte entre solicitudes
+        resultado = dict(resultado)
+        if 'fecha_evaluacion' in resultado:
+            resultado['fecha_evaluacion'] = _now_iso()
+        return resultado
+    
+    def _evaluate(self, data, snapshot):
+        """Evaluación sin caché de una solicitud con las reglas de una instantánea"""
         try:
-            errors, warnings = self.validate_basic_requirements(data)
+            errors, warnings = self.validate_basic_requirements(data, snapshot.rules)
             if errors:
                 return {
                     "aprobado": False, 
@@ -350,14 +789,14 @@ class CreditEvaluator:
                 }
             
             monto_solicitado = float(data.get('monto_solicitado', 0)) if data.get('monto_solicitado') else None
-            oferta = self.calculate_credit_offer(profile_data, monto_solicitado)
+            oferta = self.calculate_credit_offer(profile_data, monto_solicitado, snapshot)
             
             return {
                 "aprobado": True,
                 "perfil_riesgo": profile_data,
                 "oferta_credito": oferta,
                 "advertencias": warnings,
-                "fecha_evaluacion": datetime.now().isoformat()
+                "fecha_evaluacion": _now_iso()
             }
         except Exception as e:
             return {
@@ -365,34 +804,297 @@ class CreditEvaluator:
                 "motivo_rechazo": f"Error en evaluación: {str(e)}", 
                 "error_tecnico": True
             }
+    
+    def basic_requirements_mask(self, scores, ingresos, antiguedad, edades, ratio, rules=None):
+        """Máscara booleana de las solicitudes que cumplen los requisitos básicos"""
+        # Mismas condiciones que validate_basic_requirements, sobre arreglos completos
+        rules = self.rules if rules is None else rules
+        return (
+            (scores >= rules['score_minimo'])
+            & (edades >= rules['edad_minima']) & (edades <= rules['edad_maxima'])
+            & (ingresos >= rules['ingresos_minimos'])
+            & (antiguedad >= rules['antiguedad_laboral_minima'])
+            & (ratio <= rules['ratio_deuda_ingreso_maximo'])
+        )
+    
+    def evaluate_batch(self, records):
+        """Evalúa una lista de solicitudes con operaciones vectorizadas.
+        
+        Devuelve un resultado por solicitud, en el mismo orden y con el mismo
+        formato que evaluate_credit_request.
+        """
+        results = [None] * len(records)
+        # Todo el lote se evalúa con las mismas reglas aunque cambien a mitad
+        snapshot = _rules_snapshot
+        
+        # Convertir cada solicitud a columnas; las inválidas se resuelven aquí
+        rows, columns = [], ([], [], [], [], [], [])
+        for i, data in enumerate(records):
+            try:
+                values = (
+                    int(data.get('score_crediticio', 0)),
+                    float(data.get('ingresos_mensuales', 0)),
+                    int(data.get('antiguedad_laboral', 0)),
+                    int(data.get('edad', 0)),
+                    float(data.get('deudas_actuales', 0)),
+                    float(data.get('monto_solicitado', 0)) if data.get('monto_solicitado') else 0.0,
+                )
+            except Exception as e:
+                results[i] = {
+                    "aprobado": False,
+                    "motivo_rechazo": f"Error en evaluación: {str(e)}",
+                    "error_tecnico": True
+                }
+                continue
+            rows.append(i)
+            for column, value in zip(columns, values):
+                column.append(value)
+        if not rows:
+            return results
+        
+        scores, ingresos, antiguedad, edades, deudas, solicitados = (np.asarray(c) for c in columns)
+        ratio = np.divide(deudas, ingresos, out=np.ones_like(ingresos), where=ingresos > 0)
+        
+        basic_ok = self.basic_requirements_mask(scores, ingresos, antiguedad, edades, ratio, snapshot.rules)
+        
+        # Perfil de riesgo: índice de tramo por factor y suma de puntos
+        score_idx = np.digitize(scores, SCORE_BINS)
+        income_idx = np.digitize(ingresos, INCOME_BINS)
+        tenure_idx = np.digitize(antiguedad, TENURE_BINS)
+        age_idx = np.clip(edades, 0, 100)
+        dti_idx = np.digitize(ratio, DTI_BINS, right=True)
+        totals = (SCORE_POINTS[score_idx] + INCOME_POINTS[income_idx] + TENURE_POINTS[tenure_idx]
+                  + AGE_POINTS[age_idx] + DTI_POINTS[dti_idx])
+        profile_idx = np.digitize(totals, PROFILE_BINS)
+        
+        # Oferta: parámetros del perfil como arreglos alineados con PROFILE_TABLE
+        monto_max, tasa_min, tasa_max, tasa_por_punto, plazo_max = (
+            column[profile_idx] for column in snapshot.profile_arrays)
+        solicitado_ok = (solicitados != 0) & (solicitados <= monto_max)
+        montos = np.where(solicitado_ok, solicitados, monto_max)
+        tasas = np.clip(tasa_max - totals * tasa_por_punto, tasa_min, tasa_max)
+        plazos = np.minimum(TERM_CAPS_ARRAY[np.searchsorted(TERM_BINS, montos)], plazo_max)
+        pagos, totales_pago, _ = _amortization_array(
+            montos.astype(np.float64), tasas.astype(np.float64), plazos.astype(np.float64))
+        
+        fecha = _now_iso()
+        columns_out = zip(rows, basic_ok.tolist(), totals.tolist(), profile_idx.tolist(),
+                          score_idx.tolist(), income_idx.tolist(), tenure_idx.tolist(),
+                          age_idx.tolist(), dti_idx.tolist(), ratio.tolist(), ingresos.tolist(),
+                          solicitado_ok.tolist(), montos.tolist(), tasas.tolist(), plazos.tolist(),
+                          pagos.tolist(), totales_pago.tolist())
+        for (i, ok, total, p_idx, s_idx, inc_idx, t_idx, a_idx, d_idx, ratio_i, ingreso,
+             es_solicitado, monto, tasa, plazo, pago, total_pago) in columns_out:
+            if not ok:
+                # Solo las rechazadas pagan el formateo de los mensajes de error
+                errors, warnings = self.validate_basic_requirements(records[i], snapshot.rules)
+                results[i] = {
+                    "aprobado": False,
+                    "motivo_rechazo": "No cumple requisitos básicos",
+                    "errores": errors,
+                    "advertencias": warnings
+                }
+                continue
+            
+            profile_data = {
+                "perfil": PROFILE_TABLE[p_idx],
+                "score_total": total,
+                "factores": [SCORE_TABLE[s_idx][1], INCOME_TABLE[inc_idx][1], TENURE_TABLE[t_idx][1],
+                             AGE_LUT[a_idx][1], DTI_TABLE[d_idx][1]],
+                "ratio_deuda_ingreso": ratio_i if ingreso > 0 else 1
+            }
+            if p_idx == 0:
+                results[i] = {
+                    "aprobado": False,
+                    "motivo_rechazo": "Perfil de riesgo muy alto",
+                    "perfil_riesgo": profile_data,
+                    "advertencias": []
+                }
+                continue
+            
+            if plazo == 0:
+                # Mismo resultado que la evaluación individual, donde la amortización divide por cero
+                results[i] = {
+                    "aprobado": False,
+                    "motivo_rechazo": "Error en evaluación: division by zero",
+                    "error_tecnico": True
+                }
+                continue
+            if not es_solicitado:
+                # El monto máximo del perfil conserva su tipo (int) como en calculate_credit_offer
+                monto_ofrecido = snapshot.profile_lut[PROFILE_TABLE[p_idx]][0]
+            else:
+                monto_ofrecido = monto
+            
+            results[i] = {
+                "aprobado": True,
+                "perfil_riesgo": profile_data,
+                "oferta_credito": {
+                    "monto_aprobado": round(monto_ofrecido, 2),
+                    "tasa_anual": round(tasa, 2),
+                    "plazo_meses": plazo,
+                    "pago_mensual": round(pago, 2),
+                    "total_a_pagar": round(total_pago, 2),
+                    "intereses_totales": round(total_pago - monto, 2)
+                },
+                "advertencias": [],
+                "fecha_evaluacion": fecha
+            }
+        return results
+
+# Campos de la solicitud de los que depende el resultado de la evaluación
+EVALUATION_FIELDS = ('score_crediticio', 'edad', 'ingresos_mensuales', 'antiguedad_laboral',
+                     'deudas_actuales', 'monto_solicitado')
+# Marca de campo ausente (distinto de un campo presente con valor None)
+_MISSING = object()
+
+@lru_cache(maxsize=4096)
+def _evaluate_cached(key, snapshot):
+    """Evaluación de una solicitud normalizada; la generación de snapshot invalida la caché"""
+    data = {field: value for field, value in zip(EVALUATION_FIELDS, key) if value is not _MISSING}
+    return evaluator._evaluate(data, snapshot)
 
 # Inicializar
 load_business_rules()
 evaluator = CreditEvaluator()
 
+# Reglas básicas del formulario de admin: (campo, conversión, valor si falta)
+_ADMIN_RULE_FIELDS = (
+    ('score_minimo', int, 650),
+    ('edad_minima', int, 18),
+    ('edad_maxima', int, 70),
+    ('ingresos_minimos', int, 15000),
+    ('antiguedad_laboral_minima', int, 1),  # EN AÑOS
+    ('ratio_deuda_ingreso_maximo', lambda porcentaje: float(porcentaje) / 100, 0.35),
+)
+
+# Nombres de los campos por perfil en el formulario de admin
+_PERFIL_KEYS = tuple(
+    (p, f'monto_{p}', f'tasa_min_{p}', f'tasa_max_{p}', f'plazo_max_{p}') for p in PERFILES
+)
+
+# Mensaje del panel cuando el archivo de reglas no se pudo escribir
+_RULES_NOT_SAVED = "❌ Error al guardar configuración: no se pudo escribir el archivo de reglas; se mantienen las reglas anteriores"
+
+# Presentación del formulario de admin: la plantilla genera los inputs en un
+# bucle. 'scale' convierte la regla al valor mostrado (fracción -> porcentaje).
+ADMIN_FORM_GROUPS = (
+    ('Score Crediticio', (
+        {'name': 'score_minimo', 'label': 'Score Mínimo Requerido', 'min': 300, 'max': 850},
+    )),
+    ('Edad', (
+        {'name': 'edad_minima', 'label': 'Edad Mínima', 'min': 18, 'max': 25},
+        {'name': 'edad_maxima', 'label': 'Edad Máxima', 'min': 60, 'max': 80},
+    )),
+    ('Ingresos y Empleo', (
+        {'name': 'ingresos_minimos', 'label': 'Ingresos Mínimos ($)', 'min': 5000, 'step': 1000},
+        {'name': 'antiguedad_laboral_minima', 'label': 'Antigüedad Laboral Mínima (años)', 'min': 1, 'max': 10},
+    )),
+    ('Endeudamiento', (
+        {'name': 'ratio_deuda_ingreso_maximo', 'label': 'Ratio Deuda-Ingreso Máximo (%)',
+         'min': 10, 'max': 50, 'step': 5, 'scale': 100},
+    )),
+)
+
+# Inputs repetidos por perfil; el nombre del campo lleva el sufijo _<perfil>
+ADMIN_PROFILE_FIELDS = (
+    {'name': 'monto', 'label': 'Monto Máximo ($)', 'min': 10000, 'step': 5000},
+    {'name': 'tasa_min', 'label': 'Tasa Mín (%)', 'min': 5, 'max': 40, 'step': 0.5},
+    {'name': 'tasa_max', 'label': 'Tasa Máx (%)', 'min': 5, 'max': 40, 'step': 0.5},
+    {'name': 'plazo_max', 'label': 'Plazo Máx (meses)', 'min': 6, 'max': 72, 'step': 6},
+)
+
+@app.template_filter('humantime')
+def humantime(ts):
+    """Formatea un epoch como fecha/hora local legible"""
+    # El formato tiene precisión de segundos: se formatea una vez por segundo
+    return _humantime_second(int(ts))
+
+@lru_cache(maxsize=64)
+def _humantime_second(second):
+    return datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+
+# Propósitos ofrecidos en el formulario de evaluación
+PROPOSITOS = frozenset(('personal', 'auto', 'vivienda', 'educacion', 'negocio', 'consolidacion'))
+
+def _proposito(raw):
+    """Valida el propósito del crédito contra la lista cerrada del formulario"""
+    if raw not in PROPOSITOS:
+        raise ValueError(f"propósito no válido: {raw!r}")
+    return raw
+
+# Campos del formulario de evaluación: (nombre, conversión, valor por defecto).
+# Los campos vacíos o ausentes toman el valor por defecto.
+_FORM_SCHEMA = (
+    ('nombre', str, ''),
+    ('edad', int, 0),
+    ('score_crediticio', int, 0),
+    ('ingresos_mensuales', float, 0),
+    ('deudas_actuales', float, 0),
+    ('antiguedad_laboral', int, 0),  # EN AÑOS
+    ('monto_solicitado', float, None),
+    ('proposito', _proposito, 'personal'),
+)
+
+def parse_credit_form(form):
+    """Convierte el formulario de evaluación a tipos según _FORM_SCHEMA"""
+    data = {}
+    for key, cast, default in _FORM_SCHEMA:
+        raw = form.get(key)
+        data[key] = cast(raw) if raw else default
+    return data
+
+# Fragmentos de plantilla agrupados por bloque enviado en las páginas transmitidas
+STREAM_BUFFER = 64
+
+def _stream_page(template_name, context):
+    """Respuesta HTML enviada en bloques a medida que Jinja genera la página"""
+    app.update_template_context(context)
+    stream = app.jinja_env.get_template(template_name).stream(context)
+    stream.enable_buffering(STREAM_BUFFER)
+    return app.response_class(stream_with_context(stream), mimetype='text/html')
+
 def check_admin_access():
     """Verifica si el usuario tiene acceso al panel de administración"""
     return session.get('admin_authenticated', False)
 
+def _precompressed_response(body, encodings, mimetype, etag):
+    """Cuerpo ya comprimido con la mejor codificación que acepte el cliente"""
+    encoding = request.accept_encodings.best_match(tuple(encodings))
+    if encoding is None:
+        response = app.response_class(body, mimetype=mimetype)
+        response.set_etag(etag)
+    else:
+        response = app.response_class(encodings[encoding], mimetype=mimetype)
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag(f'{etag}:{encoding}')
+    response.vary.add('Accept-Encoding')
+    return response
+
+# Página de inicio sin resultado: igual para todos los clientes, se renderiza una
+# vez por generación de reglas. (generación, HTML, versiones comprimidas, ETag)
+_home_page_cache = (None, b'', {}, '')
+
+def _home_page():
+    """Página de inicio renderizada y comprimida para las reglas vigentes"""
+    global _home_page_cache
+    generation = _rules_snapshot.generation
+    if _home_page_cache[0] != generation:
+        html = render_template('main.html', resultado=None)
+        if MINIFY_HTML:
+            html = htmlmin.minify(html, remove_comments=True, remove_empty_space=True)
+        body = html.encode('utf-8')
+        _home_page_cache = (generation, body, _precompress(body), hashlib.md5(body).hexdigest())
+    return _home_page_cache
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     if request.method == 'POST':
         try:
-            # Recargar reglas por si fueron actualizadas
-            global business_rules, evaluator
+            # Recargar reglas por si fueron actualizadas (solo un stat() si no cambiaron)
             load_business_rules()
-            evaluator = CreditEvaluator()
             
-            form_data = {
-                'nombre': request.form.get('nombre', ''),
-                'edad': int(request.form.get('edad', 0)),
-                'score_crediticio': int(request.form.get('score_crediticio', 0)),
-                'ingresos_mensuales': float(request.form.get('ingresos_mensuales', 0)),
-                'deudas_actuales': float(request.form.get('deudas_actuales', 0)),
-                'antiguedad_laboral': int(request.form.get('antiguedad_laboral', 0)),  # EN AÑOS
-                'monto_solicitado': float(request.form.get('monto_solicitado', 0)) if request.form.get('monto_solicitado') else None,
-                'proposito': request.form.get('proposito', 'personal')
-            }
+            form_data = parse_credit_form(request.form)
             
             resultado = evaluator.evaluate_credit_request(form_data)
             
@@ -401,26 +1103,38 @@ def index():
             simulation_data['resultado'] = resultado
             add_simulation_to_session(simulation_data)
             
-            return render_template_string(MAIN_TEMPLATE, resultado=resultado)
+            return render_template('main.html', resultado=resultado)
         except (ValueError, TypeError) as e:
-            return render_template_string(MAIN_TEMPLATE, resultado={
+            return render_template('main.html', resultado={
                 "aprobado": False, 
                 "motivo_rechazo": f"Datos incompletos o incorrectos: {str(e)}"
             })
-    return render_template_string(MAIN_TEMPLATE, resultado=None)
+    _, body, encodings, etag = _home_page()
+    response = _precompressed_response(body, encodings, 'text/html', etag)
+    # Revalidada en cada carga: un cambio de reglas o de despliegue se ve al instante
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route('/admin_login', methods=['GET', 'POST'])
 def admin_login():
     if request.method == 'POST':
-        access_key = request.form.get('access_key', '')
-        if access_key == ADMIN_ACCESS_KEY:
+        access_key = request.form.get('access_key', '').encode('utf-8')
+        # Se comparan huellas de longitud fija en tiempo constante: no se filtra
+        # ni el contenido ni la longitud de la clave por tiempos de respuesta
+        if hmac.compare_digest(hashlib.sha256(access_key).digest(), ADMIN_ACCESS_HASH):
+            session.permanent = True
             session['admin_authenticated'] = True
             flash('Acceso autorizado al panel de administración', 'success')
             return redirect(url_for('admin'))
         else:
             flash('Clave de acceso incorrecta', 'danger')
     
-    return render_template_string(ADMIN_LOGIN_TEMPLATE)
+    return render_template('admin_login.html')
+
+def _admin_etag(snapshot):
+    """ETag débil de /admin: cambia con las reglas y con cada despliegue"""
+    return f'{_ADMIN_ETAG_PREFIX}-{snapshot.rules_etag}'
 
 @app.route('/admin', methods=['GET', 'POST'])
 def admin():
@@ -428,7 +1142,13 @@ def admin():
         flash('Acceso denegado. Ingrese la clave de acceso.', 'danger')
         return redirect(url_for('admin_login'))
     
-    global business_rules, evaluator
+    # Las mismas reglas que en la última carga del navegador: 304 sin renderizar.
+    # Con mensajes flash pendientes la página sí cambia y se renderiza.
+    if request.method == 'GET' and '_flashes' not in session:
+        not_modified = _not_modified(_admin_etag(_rules_snapshot), weak=True)
+        if not_modified is not None:
+            return not_modified
+    
     mensaje = None
     tipo_mensaje = 'info'
     
@@ -436,44 +1156,73 @@ def admin():
         try:
             action = request.form.get('action', 'save')
             if action == 'reset':
-                business_rules = DEFAULT_RULES.copy()
-                save_business_rules()
-                evaluator = CreditEvaluator()
-                mensaje = "✅ Reglas restauradas a valores por defecto"
-                tipo_mensaje = 'success'
+                if replace_business_rules(default_rules()):
+                    mensaje = "✅ Reglas restauradas a valores por defecto"
+                    tipo_mensaje = 'success'
+                else:
+                    mensaje = _RULES_NOT_SAVED
+                    tipo_mensaje = 'danger'
             elif action == 'save':
-                # Actualizar reglas básicas
-                business_rules['score_minimo'] = int(request.form.get('score_minimo', 650))
-                business_rules['edad_minima'] = int(request.form.get('edad_minima', 18))
-                business_rules['edad_maxima'] = int(request.form.get('edad_maxima', 70))
-                business_rules['ingresos_minimos'] = int(request.form.get('ingresos_minimos', 15000))
-                business_rules['antiguedad_laboral_minima'] = int(request.form.get('antiguedad_laboral_minima', 1))  # EN AÑOS
-                business_rules['ratio_deuda_ingreso_maximo'] = float(request.form.get('ratio_deuda_ingreso_maximo', 35)) / 100
-                
-                # Actualizar reglas por perfil
-                for perfil in ['AAA', 'AA', 'A', 'BBB', 'BB', 'B']:
-                    business_rules['monto_maximo_por_perfil'][perfil] = int(request.form.get(f'monto_{perfil}', 50000))
-                    business_rules['tasas_por_perfil'][perfil]['min'] = float(request.form.get(f'tasa_min_{perfil}', 10))
-                    business_rules['tasas_por_perfil'][perfil]['max'] = float(request.form.get(f'tasa_max_{perfil}', 20))
-                    business_rules['plazos_por_perfil'][perfil]['max'] = int(request.form.get(f'plazo_max_{perfil}', 24))
-                    # Mantener plazo mínimo por defecto
-                    if 'min' not in business_rules['plazos_por_perfil'][perfil]:
-                        business_rules['plazos_por_perfil'][perfil]['min'] = 6 if perfil in ['BB', 'B'] else 12
-                
-                save_business_rules()
-                evaluator = CreditEvaluator()
-                mensaje = "✅ Configuración guardada exitosamente"
-                tipo_mensaje = 'success'
+                form = request.form.to_dict()
+                get = form.get
+                # Convertir todo el formulario antes de tocar las reglas: un valor
+                # inválido no deja una actualización a medias
+                basicas = {key: cast(form[key]) if key in form else default
+                           for key, cast, default in _ADMIN_RULE_FIELDS}
+                por_perfil = [
+                    (perfil, int(get(monto_key, 50000)), float(get(tasa_min_key, 10)),
+                     float(get(tasa_max_key, 20)), int(get(plazo_max_key, 24)))
+                    for perfil, monto_key, tasa_min_key, tasa_max_key, plazo_max_key in _PERFIL_KEYS
+                ]
+                with _rules_lock:
+                    # Se edita una copia y se publica entera: nunca hay reglas a medio cambiar
+                    reglas = _thaw(business_rules)
+                    reglas.update(basicas)
+                    for perfil, monto, tasa_min, tasa_max, plazo_max in por_perfil:
+                        reglas['monto_maximo_por_perfil'][perfil] = monto
+                        tasas = reglas['tasas_por_perfil'][perfil]
+                        tasas['min'] = tasa_min
+                        tasas['max'] = tasa_max
+                        plazos = reglas['plazos_por_perfil'][perfil]
+                        plazos['max'] = plazo_max
+                        # Mantener plazo mínimo por defecto
+                        if 'min' not in plazos:
+                            plazos['min'] = 6 if perfil in ('BB', 'B') else 12
+                    
+                    saved = replace_business_rules(reglas)
+                if saved:
+                    mensaje = "✅ Configuración guardada exitosamente"
+                    tipo_mensaje = 'success'
+                else:
+                    mensaje = _RULES_NOT_SAVED
+                    tipo_mensaje = 'danger'
         except Exception as e:
             mensaje = f"❌ Error al guardar configuración: {str(e)}"
             tipo_mensaje = 'danger'
     
-    return render_template_string(ADMIN_TEMPLATE, 
-                                rules=business_rules, 
-                                mensaje=mensaje, 
-                                tipo_mensaje=tipo_mensaje,
-                                validate_rules=validate_rules,
-                                datetime=datetime)
+    # Reglas, valores por perfil y ETag de la misma instantánea (la posterior a guardar)
+    snapshot = _rules_snapshot
+    rules, profiles = snapshot.rules, snapshot.admin_profiles
+    
+    # Los mensajes flash se consumen antes de transmitir: una vez enviadas las
+    # cabeceras ya no se puede actualizar la cookie de sesión
+    get_flashed_messages(with_categories=True)
+    response = _stream_page('admin.html', {
+        'rules': rules,
+        'profiles': profiles,
+        'form_groups': ADMIN_FORM_GROUPS,
+        'profile_fields': ADMIN_PROFILE_FIELDS,
+        'mensaje': mensaje,
+        'tipo_mensaje': tipo_mensaje,
+        'generated_at': humantime(time.time()),
+    })
+    if request.method == 'GET':
+        # Débil: la hora de generación cambia el cuerpo, no las reglas mostradas
+        response.set_etag(_admin_etag(snapshot), weak=True)
+    # Solo para el administrador y siempre revalidada tras guardar cambios
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
 
 @app.route('/admin_logout')
 def admin_logout():
@@ -481,36 +1230,125 @@ def admin_logout():
     flash('Sesión de administración cerrada', 'info')
     return redirect(url_for('index'))
 
-@app.route('/reports')
-def reports():
-    # Generar estadísticas de la sesión
-    total_simulations = len(session_simulations)
-    approved_count = len([s for s in session_simulations if s['aprobado']])
-    rejected_count = total_simulations - approved_count
+# Celdas de estado y etiquetas de perfil ya escapadas, compartidas por todas las filas
+_STATUS_CELLS = {
+    True: Markup('<td class="status-approved">✅ APROBADO</td>'),
+    False: Markup('<td class="status-rejected">❌ RECHAZADO</td>'),
+}
+_BADGE_HTML = Markup('<span class="profile-badge profile-{0}">{0}</span>')
+_PROFILE_BADGES = {code: _BADGE_HTML.format(code) for code in PROFILE_CODES}
+
+# Bloques fijos del dashboard: solo la fecha de generación cambia entre renders
+_REPORT_FOOTER_HTML = Markup(
+    '<div class="report-card">'
+    '<h3 class="section-title">📝 Información del Reporte</h3>'
+    '<div class="profile-stats">'
+    '<div class="profile-stat"><h4>Generado</h4><p>{generated_at}</p></div>'
+    '<div class="profile-stat"><h4>Sistema</h4><p>Hotmart Credit Simulator v2.0</p></div>'
+    f'<div class="profile-stat"><h4>Alcance</h4><p>Simulaciones de Sesión (Máx. {SIMULATION_LIMIT})</p></div>'
+    '<div class="profile-stat"><h4>Uso</h4><p>Evaluación del Módulo de Curso</p></div>'
+    '</div>'
+    '</div>'
+)
+# Tarjetas de factores de rechazo: misma estructura, solo cambian título, conteo y condición
+_REJECTION_CARD_HTML = Markup(
+    '<div class="profile-stat"><h4>{title}</h4>'
+    '<p><strong>{count}</strong> rechazos</p><p>{condition}</p></div>'
+)
+_REJECTION_FACTORS = (
+    ('Score Bajo', Markup('Score &lt; 650')),
+    ('Ingresos Bajos', Markup('Ingresos &lt; $15,000')),
+    ('Poca Experiencia', Markup('Antigüedad &lt; 1 año')),
+)
+
+def _rejection_cards(counts):
+    """HTML de las tarjetas de factores de rechazo para los conteos dados"""
+    return Markup('').join(_REJECTION_CARD_HTML.format(title=title, count=count, condition=condition)
+                           for (title, condition), count in zip(_REJECTION_FACTORS, counts))
+
+_REPORT_NO_DATA_HTML = Markup(
+    '<div class="report-card">'
+    '<div class="no-data">'
+    '<h3>📊 No hay simulaciones registradas</h3>'
+    '<p>Realice algunas evaluaciones de crédito para ver el dashboard de reportes.</p>'
+    '<a href="/" class="btn-action" style="margin-top: 20px;">🏠 Ir a Evaluaciones</a>'
+    '</div>'
+    '</div>'
+)
+
+def _simulation_row(sim):
+    """Textos ya formateados de una fila de la tabla de simulaciones"""
+    motivo = sim.motivo_rechazo
+    return {
+        'fecha': humantime(sim.ts),
+        'nombre': sim.nombre,
+        'edad': sim.edad,
+        'score_crediticio': sim.score_crediticio,
+        'ingresos_fmt': f"${sim.ingresos_mensuales:,.0f}",
+        'antiguedad_laboral': sim.antiguedad_laboral,
+        'aprobado': sim.aprobado,
+        'perfil': sim.perfil,
+        'status_html': _STATUS_CELLS[bool(sim.aprobado)],
+        'badge_html': _PROFILE_BADGES.get(sim.perfil) or _BADGE_HTML.format(sim.perfil),
+        'monto_fmt': f"${sim.monto_aprobado:,.0f}" if sim.monto_aprobado > 0 else '-',
+        'tasa_fmt': f"{sim.tasa_anual:.1f}%" if sim.tasa_anual > 0 else '-',
+        'motivo_short': motivo[:50] + '...' if len(motivo) > 50 else motivo,
+    }
+
+def _json_response(payload, status=200):
+    """Respuesta JSON serializada con orjson si está disponible (si no, jsonify)"""
+    if orjson is not None:
+        try:
+            return app.response_class(orjson.dumps(payload), status=status, mimetype='application/json')
+        except TypeError:
+            # orjson no admite enteros de más de 64 bits: se usa la serialización estándar
+            pass
+    response = jsonify(payload)
+    response.status_code = status
+    return response
+
+def _not_modified(etag, weak=False):
+    """Respuesta 304 si If-None-Match trae el ETag; si no, None.
     
-    # Estadísticas por perfil
-    profile_stats = {}
-    approved_amount = 0
+    Flask-Compress añade el algoritmo al ETag fuerte de las respuestas
+    comprimidas ("etag:br"), así que también se aceptan esas variantes; los
+    ETag débiles no se modifican. If-None-Match usa comparación débil.
+    """
+    if_none_match = request.if_none_match
+    candidates = (etag,) if weak else (
+        etag, *(f'{etag}:{alg}' for alg in app.config['COMPRESS_ALGORITHM']))
+    for candidate in candidates:
+        if if_none_match.contains_weak(candidate):
+            response = app.response_class(status=304)
+            response.set_etag(candidate, weak=weak)
+            return response
+    return None
+
+def _simulation_stats(total_simulations, columns):
+    """Estadísticas del dashboard a partir de una copia de las columnas"""
+    # Las ranuras vacías no cuentan
+    approved = columns['approved']
+    approved_count = int(np.count_nonzero(approved))
+    rejected_count = total_simulations - approved_count
     
-    for sim in session_simulations:
-        if sim['aprobado']:
-            approved_amount += sim['monto_aprobado']
-            perfil = sim['perfil']
-            if perfil in profile_stats:
-                profile_stats[perfil]['count'] += 1
-                profile_stats[perfil]['total_amount'] += sim['monto_aprobado']
-            else:
-                profile_stats[perfil] = {
-                    'count': 1, 
-                    'total_amount': sim['monto_aprobado'],
-                    'avg_rate': sim['tasa_anual']
-                }
+    # Estadísticas por perfil (solo aprobadas), reducidas con bincount
+    profile_ids = columns['profile_id'][approved]
+    n_profiles = len(PROFILE_CODES)
+    counts = np.bincount(profile_ids, minlength=n_profiles)
+    amounts = np.bincount(profile_ids, weights=columns['amount'][approved], minlength=n_profiles)
+    rates = np.bincount(profile_ids, weights=columns['rate'][approved], minlength=n_profiles)
+    approved_amount = float(amounts.sum())
     
-    # Calcular promedios para perfiles
-    for perfil in profile_stats:
-        profile_stats[perfil]['avg_amount'] = profile_stats[perfil]['total_amount'] / profile_stats[perfil]['count']
+    profile_stats = {}
+    for i in np.flatnonzero(counts):
+        profile_stats[PROFILE_CODES[i]] = {
+            'count': int(counts[i]),
+            'total_amount': float(amounts[i]),
+            'avg_amount': float(amounts[i] / counts[i]),
+            'avg_rate': float(rates[i] / counts[i])
+        }
     
-    stats = {
+    return {
         'total_simulations': total_simulations,
         'approved_count': approved_count,
         'rejected_count': rejected_count,
@@ -519,49 +1357,127 @@ def reports():
         'avg_approved_amount': approved_amount / approved_count if approved_count > 0 else 0,
         'profile_stats': profile_stats
     }
+
+@app.route('/reports')
+def reports():
+    global _reports_fragments
+    # Copia consistente de las simulaciones para calcular estadísticas
+    with _simulations_lock:
+        total = len(session_simulations)
+        columns = _simulation_columns.copy()
+        rejected_count, score_reject_count, income_reject_count, exp_reject_count = _rejection_counts
+        version = _simulations_version
+        cached_version, fragments = _reports_fragments
+        # Los registros solo hacen falta para re-renderizar la tabla de otra versión
+        simulations = list(session_simulations) if cached_version != version else None
+    
+    # Mismas simulaciones que la última vez que el navegador cargó la página: 304 sin renderizar
+    etag = f'{_REPORTS_ETAG_PREFIX}-{version}'
+    not_modified = _not_modified(etag, weak=True)
+    if not_modified is not None:
+        return not_modified
+    
+    stats = _simulation_stats(total, columns)
+    
+    # Análisis de rechazos
+    rejection_rate = 100.0 * rejected_count / max(1, total)
+    
+    # Tabla y distribución por perfil solo se re-renderizan si hubo cambios
+    if cached_version != version:
+        fragments = {
+            'profile_stats': Markup(render_template('_profile_stats.html', stats=stats)),
+            'simulations_table': Markup(render_template('_simulations_table.html',
+                                                        rows=[_simulation_row(sim) for sim in simulations])),
+            'rejection_cards': _rejection_cards((score_reject_count, income_reject_count, exp_reject_count)),
+        }
+        _reports_fragments = (version, fragments)
+    
+    context = {
+        'stats': stats,
+        'rejected_count': rejected_count,
+        'rejection_rate': rejection_rate,
+        'fragments': fragments,
+        'footer_html': _REPORT_FOOTER_HTML.format(generated_at=humantime(time.time())),
+        'no_data_html': _REPORT_NO_DATA_HTML,
+    }
+    # La página se envía en bloques a medida que Jinja la genera, sin armar el HTML completo
+    response = _stream_page('reports.html', context)
+    # Débil: la hora de generación cambia el cuerpo, no su contenido relevante
+    response.set_etag(etag, weak=True)
+    # Privada y siempre revalidada: una nueva simulación debe verse en la siguiente carga
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+# Filas por página de /reports/data
+REPORTS_PAGE_SIZE = 50
+
+@app.route('/reports/data')
+def reports_data():
+    """Estadísticas y una página de filas del dashboard en JSON"""
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', REPORTS_PAGE_SIZE, type=int), 1), REPORTS_PAGE_SIZE)
+    # Solo se copia la página pedida; las estadísticas salen de las columnas
+    with _simulations_lock:
+        total = len(session_simulations)
+        page = list(islice(session_simulations, offset, offset + limit))
+        columns = _simulation_columns.copy()
     
-    return render_template_string(REPORTS_TEMPLATE, 
-                                simulations=session_simulations,
-                                stats=stats,
-                                datetime=datetime)
+    rows = [
+        {key: value for key, value in _simulation_row(sim).items() if not isinstance(value, Markup)}
+        for sim in page
+    ]
+    data = {
+        'stats': _simulation_stats(total, columns),
+        'rows': rows,
+        'offset': offset,
+        'total': total,
+    }
+    return _json_response(data)
 
 @app.route('/clear_session')
 def clear_session():
     """Limpiar simulaciones de la sesión"""
-    global session_simulations
-    session_simulations = []
+    global _simulation_slot, _simulations_version
+    with _simulations_lock:
+        session_simulations.clear()
+        _simulation_columns[:] = 0
+        _rejection_counts[:] = [0, 0, 0, 0]
+        _simulation_slot = 0
+        _simulations_version += 1
     flash('Simulaciones de sesión limpiadas', 'info')
     return redirect(url_for('reports'))
 
+# Solicitudes de ejemplo de /api/test/<profile>, de solo lectura
+TEST_CASES = _freeze({
+    'AAA': {
+        'nombre': 'Cliente AAA Test', 'edad': 35, 'score_crediticio': 820, 
+        'ingresos_mensuales': 60000, 'deudas_actuales': 5000, 
+        'antiguedad_laboral': 5, 'monto_solicitado': 150000  # EN AÑOS
+    },
+    'AA': {
+        'nombre': 'Cliente AA Test', 'edad': 40, 'score_crediticio': 780, 
+        'ingresos_mensuales': 45000, 'deudas_actuales': 8000, 
+        'antiguedad_laboral': 4, 'monto_solicitado': 120000  # EN AÑOS
+    },
+    'A': {
+        'nombre': 'Cliente A Test', 'edad': 30, 'score_crediticio': 720, 
+        'ingresos_mensuales': 30000, 'deudas_actuales': 6000, 
+        'antiguedad_laboral': 3, 'monto_solicitado': 80000  # EN AÑOS
+    },
+    'REJECT': {
+        'nombre': 'Cliente Rechazado Test', 'edad': 22, 'score_crediticio': 580, 
+        'ingresos_mensuales': 12000, 'deudas_actuales': 8000, 
+        'antiguedad_laboral': 0, 'monto_solicitado': 50000  # EN AÑOS (menos de 1)
+    }
+})
+
 @app.route('/api/test/<profile>')
 def test_profile(profile):
-    test_data = {
-        'AAA': {
-            'nombre': 'Cliente AAA Test', 'edad': 35, 'score_crediticio': 820, 
-            'ingresos_mensuales': 60000, 'deudas_actuales': 5000, 
-            'antiguedad_laboral': 5, 'monto_solicitado': 150000  # EN AÑOS
-        },
-        'AA': {
-            'nombre': 'Cliente AA Test', 'edad': 40, 'score_crediticio': 780, 
-            'ingresos_mensuales': 45000, 'deudas_actuales': 8000, 
-            'antiguedad_laboral': 4, 'monto_solicitado': 120000  # EN AÑOS
-        },
-        'A': {
-            'nombre': 'Cliente A Test', 'edad': 30, 'score_crediticio': 720, 
-            'ingresos_mensuales': 30000, 'deudas_actuales': 6000, 
-            'antiguedad_laboral': 3, 'monto_solicitado': 80000  # EN AÑOS
-        },
-        'REJECT': {
-            'nombre': 'Cliente Rechazado Test', 'edad': 22, 'score_crediticio': 580, 
-            'ingresos_mensuales': 12000, 'deudas_actuales': 8000, 
-            'antiguedad_laboral': 0, 'monto_solicitado': 50000  # EN AÑOS (menos de 1)
-        }
-    }
-    
-    if profile.upper() not in test_data:
-        return jsonify({'error': 'Perfil no encontrado'}), 404
+    if profile.upper() not in TEST_CASES:
+        return _json_response({'error': 'Perfil no encontrado'}, 404)
     
-    data = test_data[profile.upper()]
+    data = dict(TEST_CASES[profile.upper()])
     resultado = evaluator.evaluate_credit_request(data)
     
     # Agregar a simulaciones de sesión
@@ -569,7 +1485,7 @@ def test_profile(profile):
     simulation_data['resultado'] = resultado
     add_simulation_to_session(simulation_data)
     
-    return jsonify({
+    return _json_response({
         'perfil_test': profile.upper(),
         'datos_entrada': data,
         'resultado_evaluacion': resultado
@@ -577,653 +1493,141 @@ def test_profile(profile):
 
 @app.route('/api/rules')
 def get_rules():
-    return jsonify(business_rules)
+    snapshot = _rules_snapshot
+    body, etag = snapshot.rules_json, snapshot.rules_etag
+    # Responde 304 sin cuerpo si el cliente ya tiene esta versión
+    response = _not_modified(etag)
+    if response is None:
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+    # Igual para todos los clientes: navegadores y proxies pueden guardarla, pero
+    # revalidan con el ETag para ver al instante los cambios del panel de admin
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response
+
+@app.route('/api/evaluate_batch', methods=['POST'])
+@app.route('/evaluate/batch', methods=['POST'])
+def api_evaluate_batch():
+    """API para evaluar una lista de solicitudes (JSON o CSV) en una sola llamada"""
+    try:
+        if request.mimetype == 'text/csv':
+            # Una solicitud por fila; la cabecera trae los nombres de los campos
+            data = list(csv.DictReader(io.StringIO(request.get_data(as_text=True))))
+        else:
+            data = _request_json()
+        if not isinstance(data, list):
+            return _json_response({'error': 'Se esperaba una lista de solicitudes'}, 400)
+        
+        return _json_response(evaluator.evaluate_batch(data))
+    except Exception as e:
+        return _json_response({'error': str(e)}, 500)
+
+def _request_json():
+    """Decodifica el cuerpo JSON de la petición (con orjson si está disponible)"""
+    body = request.get_data()
+    if not body:
+        return None
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
 
 @app.route('/api/evaluate', methods=['POST'])
 def api_evaluate():
     """API para evaluar crédito via JSON"""
     try:
-        data = request.json
+        data = _request_json()
         if not data:
-            return jsonify({'error': 'No data provided'}), 400
+            return _json_response({'error': 'No data provided'}, 400)
         
         resultado = evaluator.evaluate_credit_request(data)
-        return jsonify(resultado)
+        return _json_response(resultado)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-# ===== TEMPLATES HTML =====
-ADMIN_LOGIN_TEMPLATE = '''
-<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Acceso Admin - Hotmart Credit</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); min-height: 100vh; display: flex; align-items: center; justify-content: center; }
-        .login-card { background: white; border-radius: 15px; padding: 40px; box-shadow: 0 10px 30px rgba(0,0,0,0.3); max-width: 400px; width: 100%; }
-        .login-header { text-align: center; margin-bottom: 30px; }
-        .login-header h1 { color: #667eea; margin-bottom: 10px; }
-        .login-header .subtitle { color: #666; font-size: 14px; }
-        .form-group { margin-bottom: 20px; }
-        .form-group label { display: block; margin-bottom: 8px; font-weight: 600; color: #333; }
-        .form-group input { width: 100%; padding: 15px; border: 2px solid #e1e1e1; border-radius: 8px; font-size: 16px; text-align: center; letter-spacing: 2px; }
-        .form-group input:focus { outline: none; border-color: #667eea; }
-        .login-btn { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border: none; padding: 15px; border-radius: 8px; font-size: 18px; font-weight: 600; cursor: pointer; width: 100%; margin-bottom: 20px; transition: all 0.3s ease; }
-        .login-btn:hover { transform: translateY(-2px); box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4); }
-        .back-link { text-align: center; }
-        .back-link a { color: #667eea; text-decoration: none; font-weight: 600; }
-        .alert { padding: 15px; border-radius: 5px; margin-bottom: 20px; }
-        .alert-success { background: #d4edda; color: #155724; border: 1px solid #c3e6cb; }
-        .alert-danger { background: #f8d7da; color: #721c24; border: 1px solid #f5c6cb; }
-        .key-hint { background: #e3f2fd; padding: 15px; border-radius: 8px; margin-bottom: 20px; text-align: center; color: #1565c0; font-size: 14px; }
-    </style>
-</head>
-<body>
-    <div class="login-card">
-        <div class="login-header">
-            <h1>🔐 Acceso Administrativo</h1>
-            <p class="subtitle">Panel de Configuración de Reglas de Negocio</p>
-        </div>
-        <div class="key-hint">
-            <strong>🔑 Clave de Acceso Requerida</strong><br>
-            Ingrese la clave para acceder al módulo administrativo
-        </div>
-        {% with messages = get_flashed_messages(with_categories=true) %}
-            {% if messages %}
-                {% for category, message in messages %}
-                    <div class="alert alert-{{ category }}">{{ message }}</div>
-                {% endfor %}
-            {% endif %}
-        {% endwith %}
-        <form method="POST">
-            <div class="form-group">
-                <label for="access_key">Clave de Acceso</label>
-                <input type="password" id="access_key" name="access_key" placeholder="Ingrese clave" required>
-            </div>
-            <button type="submit" class="login-btn">🚀 Acceder al Panel</button>
-        </form>
-        <div class="back-link">
-            <a href="/">← Volver al Simulador</a>
-        </div>
-    </div>
-</body>
-</html>
-'''
-
-MAIN_TEMPLATE = '''
-<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Simulador de Crédito Hotmart</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); min-height: 100vh; }
-        .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
-        .header { text-align: center; color: white; margin-bottom: 30px; }
-        .header h1 { font-size: 2.5rem; margin-bottom: 10px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3); }
-        .header p { font-size: 1.2rem; opacity: 0.9; }
-        .nav-buttons { display: flex; gap: 15px; justify-content: center; margin-bottom: 30px; }
-        .nav-btn { padding: 12px 24px; background: rgba(255,255,255,0.2); color: white; text-decoration: none; border-radius: 25px; border: 2px solid rgba(255,255,255,0.3); transition: all 0.3s ease; font-weight: 600; }
-        .nav-btn:hover { background: rgba(255,255,255,0.3); transform: translateY(-2px); }
-        .nav-btn.active { background: rgba(255,255,255,0.9); color: #667eea; }
-        .form-card { background: white; border-radius: 15px; padding: 30px; box-shadow: 0 10px 30px rgba(0,0,0,0.2); margin-bottom: 20px; }
-        .form-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; }
-        .form-group { margin-bottom: 20px; }
-        .form-group label { display: block; margin-bottom: 8px; font-weight: 600; color: #333; }
-        .form-group input, .form-group select { width: 100%; padding: 12px; border: 2px solid #e1e1e1; border-radius: 8px; font-size: 16px; transition: border-color 0.3s ease; }
-        .form-group input:focus, .form-group select:focus { outline: none; border-color: #667eea; }
-        .submit-btn { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border: none; padding: 15px 40px; border-radius: 8px; font-size: 18px; font-weight: 600; cursor: pointer; transition: all 0.3s ease; width: 100%; }
-        .submit-btn:hover { transform: translateY(-2px); box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4); }
-        .result-card { background: white; border-radius: 15px; padding: 30px; box-shadow: 0 10px 30px rgba(0,0,0,0.2); margin-top: 20px; }
-        .result-approved { border-left: 5px solid #28a745; }
-        .result-rejected { border-left: 5px solid #dc3545; }
-        .profile-badge { display: inline-block; padding: 5px 12px; border-radius: 20px; font-weight: bold; text-transform: uppercase; font-size: 12px; }
-        .profile-AAA { background: #28a745; color: white; }
-        .profile-AA { background: #17a2b8; color: white; }
-        .profile-A { background: #007bff; color: white; }
-        .profile-BBB { background: #ffc107; color: black; }
-        .profile-BB { background: #fd7e14; color: white; }
-        .profile-B { background: #dc3545; color: white; }
-        .offer-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0; }
-        .offer-item { text-align: center; padding: 20px; background: #f8f9fa; border-radius: 10px; }
-        .offer-item h4 { color: #667eea; margin-bottom: 10px; }
-        .offer-item .value { font-size: 1.5rem; font-weight: bold; color: #333; }
-        .factors-list { margin: 15px 0; }
-        .factors-list li { margin: 5px 0; padding: 8px; background: #e9ecef; border-radius: 5px; }
-        @media (max-width: 768px) {
-            .header h1 { font-size: 2rem; }
-            .nav-buttons { flex-direction: column; align-items: center; }
-            .form-grid { grid-template-columns: 1fr; }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🏦 Simulador de Crédito Hotmart</h1>
-            <p>Sistema Integral de Evaluación Crediticia</p>
-        </div>
-        <div class="nav-buttons">
-            <a href="/" class="nav-btn active">🏠 Evaluación</a>
-            <a href="/admin_login" class="nav-btn">⚙️ Administración</a>
-            <a href="/reports" class="nav-btn">📊 Reportes</a>
-        </div>
-        <div class="form-card">
-            <form method="POST">
-                <h2 style="margin-bottom: 25px; color: #333;">📋 Información del Solicitante</h2>
-                <div class="form-grid">
-                    <div class="form-group"><label for="nombre">Nombre Completo *</label><input type="text" id="nombre" name="nombre" required></div>
-                    <div class="form-group"><label for="edad">Edad *</label><input type="number" id="edad" name="edad" min="18" max="80" required></div>
-                    <div class="form-group"><label for="score_crediticio">Score Crediticio (300-850) *</label><input type="number" id="score_crediticio" name="score_crediticio" min="300" max="850" required></div>
-                    <div class="form-group"><label for="ingresos_mensuales">Ingresos Mensuales ($) *</label><input type="number" id="ingresos_mensuales" name="ingresos_mensuales" min="0" step="0.01" required></div>
-                    <div class="form-group"><label for="deudas_actuales">Deudas Actuales ($)</label><input type="number" id="deudas_actuales" name="deudas_actuales" min="0" step="0.01" value="0"></div>
-                    <div class="form-group"><label for="antiguedad_laboral">Antigüedad Laboral (años) *</label><input type="number" id="antiguedad_laboral" name="antiguedad_laboral" min="0" max="50" required></div>
-                    <div class="form-group"><label for="monto_solicitado">Monto Solicitado ($)</label><input type="number" id="monto_solicitado" name="monto_solicitado" min="1000" step="1000" placeholder="Opcional - se calculará automáticamente"></div>
-                    <div class="form-group"><label for="proposito">Propósito del Crédito</label><select id="proposito" name="proposito"><option value="personal">Uso Personal</option><option value="auto">Compra de Vehículo</option><option value="vivienda">Mejoras al Hogar</option><option value="educacion">Educación</option><option value="negocio">Inversión en Negocio</option><option value="consolidacion">Consolidación de Deudas</option></select></div>
-                </div>
-                <button type="submit" class="submit-btn">🔍 Evaluar Solicitud de Crédito</button>
-            </form>
-        </div>
-        {% if resultado %}
-        <div class="result-card {% if resultado.aprobado %}result-approved{% else %}result-rejected{% endif %}">
-            <h2 style="margin-bottom: 20px; color: {% if resultado.aprobado %}#28a745{% else %}#dc3545{% endif %};">
-                {% if resultado.aprobado %}✅ CRÉDITO APROBADO{% else %}❌ CRÉDITO RECHAZADO{% endif %}
-            </h2>
-            {% if not resultado.aprobado %}
-            <div style="background: #f8d7da; padding: 15px; border-radius: 8px; margin: 15px 0;">
-                <h4>Motivo del Rechazo:</h4>
-                <p><strong>{{ resultado.motivo_rechazo }}</strong></p>
-                {% if resultado.errores %}
-                <ul style="margin: 10px 0; margin-left: 20px;">
-                {% for error in resultado.errores %}
-                    <li>{{ error }}</li>
-                {% endfor %}
-                </ul>
-                {% endif %}
-            </div>
-            {% endif %}
-            {% if resultado.perfil_riesgo %}
-                <div style="background: #e9ecef; padding: 20px; border-radius: 10px; margin: 20px 0;">
-                    <h3>📈 Análisis de Perfil</h3>
-                    <p><span>Perfil de Riesgo: </span><span class="profile-badge profile-{{ resultado.perfil_riesgo.perfil }}">{{ resultado.perfil_riesgo.perfil }}</span></p>
-                    <p><strong>Score Interno:</strong> {{ resultado.perfil_riesgo.score_total }}/100</p>
-                    <p><strong>Ratio Deuda-Ingreso:</strong> {{ "%.2f"|format(resultado.perfil_riesgo.ratio_deuda_ingreso * 100) }}%</p>
-                    <h4 style="margin: 15px 0 10px 0;">Factores Evaluados:</h4>
-                    <ul class="factors-list">
-                    {% for factor in resultado.perfil_riesgo.factores %}
-                        <li>{{ factor }}</li>
-                    {% endfor %}
-                    </ul>
-                </div>
-            {% endif %}
-            {% if resultado.oferta_credito %}
-                <div style="background: #d4edda; padding: 20px; border-radius: 10px; margin: 20px 0;">
-                    <h3>💰 Oferta de Crédito</h3>
-                    <div class="offer-grid">
-                        <div class="offer-item"><h4>Monto Aprobado</h4><div class="value">${{ "{:,.0f}".format(resultado.oferta_credito.monto_aprobado) }}</div></div>
-                        <div class="offer-item"><h4>Tasa Anual</h4><div class="value">{{ resultado.oferta_credito.tasa_anual }}%</div></div>
-                        <div class="offer-item"><h4>Plazo</h4><div class="value">{{ resultado.oferta_credito.plazo_meses }} meses</div></div>
-                        <div class="offer-item"><h4>Pago Mensual</h4><div class="value">${{ "{:,.0f}".format(resultado.oferta_credito.pago_mensual) }}</div></div>
-                        <div class="offer-item"><h4>Total a Pagar</h4><div class="value">${{ "{:,.0f}".format(resultado.oferta_credito.total_a_pagar) }}</div></div>
-                        <div class="offer-item"><h4>Intereses Totales</h4><div class="value">${{ "{:,.0f}".format(resultado.oferta_credito.intereses_totales) }}</div></div>
-                    </div>
-                </div>
-            {% endif %}
-            {% if resultado.advertencias %}
-                <div style="background: #fff3cd; padding: 15px; border-radius: 8px; margin: 15px 0;">
-                    <h4>⚠️ Advertencias:</h4>
-                    <ul style="margin: 10px 0; margin-left: 20px;">
-                    {% for warning in resultado.advertencias %}
-                        <li>{{ warning }}</li>
-                    {% endfor %}
-                    </ul>
-                </div>
-            {% endif %}
-        </div>
-        {% endif %}
-    </div>
-</body>
-</html>
-'''
-
-ADMIN_TEMPLATE = '''
-<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Panel de Administración - Hotmart Credit</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); min-height: 100vh; }
-        .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
-        .header { text-align: center; color: white; margin-bottom: 30px; }
-        .header h1 { font-size: 2.5rem; margin-bottom: 10px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3); }
-        .nav-buttons { display: flex; gap: 15px; justify-content: center; margin-bottom: 30px; }
-        .nav-btn { padding: 12px 24px; background: rgba(255,255,255,0.2); color: white; text-decoration: none; border-radius: 25px; border: 2px solid rgba(255,255,255,0.3); transition: all 0.3s ease; font-weight: 600; }
-        .nav-btn:hover { background: rgba(255,255,255,0.3); transform: translateY(-2px); }
-        .nav-btn.active { background: rgba(255,255,255,0.9); color: #667eea; }
-        .admin-card { background: white; border-radius: 15px; padding: 30px; box-shadow: 0 10px 30px rgba(0,0,0,0.2); margin-bottom: 30px; }
-        .admin-section { margin-bottom: 40px; }
-        .admin-section h3 { color: #333; margin-bottom: 20px; padding-bottom: 10px; border-bottom: 2px solid #667eea; }
-        .rules-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; }
-        .rule-group { background: #f8f9fa; padding: 20px; border-radius: 10px; border-left: 4px solid #667eea; }
-        .rule-group h4 { color: #333; margin-bottom: 15px; }
-        .form-group { margin-bottom: 15px; }
-        .form-group label { display: block; margin-bottom: 5px; font-weight: 600; color: #555; }
-        .form-group input { width: 100%; padding: 10px; border: 1px solid #ddd; border-radius: 5px; }
-        .profile-rules { background: #f8f9fa; padding: 20px; border-radius: 10px; margin: 10px 0; }
-        .profile-title { font-weight: bold; margin-bottom: 10px; color: #333; }
-        .profile-inputs { display: grid; grid-template-columns: 1fr 1fr 1fr 1fr; gap: 10px; }
-        .btn-primary { background: #667eea; color: white; border: none; padding: 12px 30px; border-radius: 5px; cursor: pointer; font-weight: 600; transition: all 0.3s ease; }
-        .btn-primary:hover { background: #5a67d8; }
-        .btn-secondary { background: #6c757d; color: white; border: none; padding: 12px 30px; border-radius: 5px; cursor: pointer; font-weight: 600; margin-left: 10px; transition: all 0.3s ease; }
-        .btn-secondary:hover { background: #5a6268; }
-        .btn-logout { background: #dc3545; color: white; border: none; padding: 8px 20px; border-radius: 5px; cursor: pointer; font-weight: 600; margin-left: 10px; transition: all 0.3s ease; font-size: 14px; }
-        .btn-logout:hover { background: #c82333; }
-        .alert { padding: 15px; border-radius: 5px; margin: 15px 0; }
-        .alert-success { background: #d4edda; color: #155724; border: 1px solid #c3e6cb; }
-        .alert-danger { background: #f8d7da; color: #721c24; border: 1px solid #f5c6cb; }
-        .admin-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px; }
-        @media (max-width: 768px) {
-            .rules-grid { grid-template-columns: 1fr; }
-            .profile-inputs { grid-template-columns: 1fr 1fr; }
-            .admin-header { flex-direction: column; gap: 15px; }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>⚙️ Panel de Administración</h1>
-            <p>Configuración de Reglas de Negocio - Acceso Autorizado</p>
-        </div>
-        <div class="nav-buttons">
-            <a href="/" class="nav-btn">🏠 Evaluación</a>
-            <a href="/admin" class="nav-btn active">⚙️ Administración</a>
-            <a href="/reports" class="nav-btn">📊 Reportes</a>
-            <a href="/admin_logout" class="nav-btn" style="background: rgba(220,53,69,0.8);">🚪 Cerrar Sesión</a>
-        </div>
-        {% with messages = get_flashed_messages(with_categories=true) %}
-            {% if messages %}
-                {% for category, message in messages %}
-                    <div class="alert alert-{{ category }}">{{ message }}</div>
-                {% endfor %}
-            {% endif %}
-        {% endwith %}
-        {% if mensaje %}<div class="alert alert-{{ tipo_mensaje }}">{{ mensaje }}</div>{% endif %}
-        <div class="admin-card">
-            <div class="admin-header">
-                <h3>🔧 Configuración del Sistema</h3>
-                <div>
-                    <span style="color: #28a745; font-weight: bold;">✅ Sesión Administrativa Activa</span>
-                </div>
-            </div>
-            <form method="POST">
-                <div class="admin-section">
-                    <h3>📋 Requisitos Básicos</h3>
-                    <div class="rules-grid">
-                        <div class="rule-group">
-                            <h4>Score Crediticio</h4>
-                            <div class="form-group"><label>Score Mínimo Requerido</label><input type="number" name="score_minimo" value="{{ rules.score_minimo }}" min="300" max="850"></div>
-                        </div>
-                        <div class="rule-group">
-                            <h4>Edad</h4>
-                            <div class="form-group"><label>Edad Mínima</label><input type="number" name="edad_minima" value="{{ rules.edad_minima }}" min="18" max="25"></div>
-                            <div class="form-group"><label>Edad Máxima</label><input type="number" name="edad_maxima" value="{{ rules.edad_maxima }}" min="60" max="80"></div>
-                        </div>
-                        <div class="rule-group">
-                            <h4>Ingresos y Empleo</h4>
-                            <div class="form-group"><label>Ingresos Mínimos ($)</label><input type="number" name="ingresos_minimos" value="{{ rules.ingresos_minimos }}" min="5000" step="1000"></div>
-                            <div class="form-group"><label>Antigüedad Laboral Mínima (años)</label><input type="number" name="antiguedad_laboral_minima" value="{{ rules.antiguedad_laboral_minima }}" min="1" max="10"></div>
-                        </div>
-                        <div class="rule-group">
-                            <h4>Endeudamiento</h4>
-                            <div class="form-group"><label>Ratio Deuda-Ingreso Máximo (%)</label><input type="number" name="ratio_deuda_ingreso_maximo" value="{{ (rules.ratio_deuda_ingreso_maximo * 100)|round|int }}" min="10" max="50" step="5"></div>
-                        </div>
-                    </div>
-                </div>
-                <div class="admin-section">
-                    <h3>💰 Configuración por Perfil de Riesgo</h3>
-                    {% for perfil in ['AAA', 'AA', 'A', 'BBB', 'BB', 'B'] %}
-                    <div class="profile-rules">
-                        <div class="profile-title">Perfil {{ perfil }}</div>
-                        <div class="profile-inputs">
-                            <div><label>Monto Máximo ($)</label><input type="number" name="monto_{{ perfil }}" value="{{ rules.monto_maximo_por_perfil[perfil] }}" min="10000" step="5000"></div>
-                            <div><label>Tasa Mín (%)</label><input type="number" name="tasa_min_{{ perfil }}" value="{{ rules.tasas_por_perfil[perfil].min }}" min="5" max="40" step="0.5"></div>
-                            <div><label>Tasa Máx (%)</label><input type="number" name="tasa_max_{{ perfil }}" value="{{ rules.tasas_por_perfil[perfil].max }}" min="5" max="40" step="0.5"></div>
-                            <div><label>Plazo Máx (meses)</label><input type="number" name="plazo_max_{{ perfil }}" value="{{ rules.plazos_por_perfil[perfil].max }}" min="6" max="72" step="6"></div>
-                        </div>
-                    </div>
-                    {% endfor %}
-                </div>
-                <div style="text-align: center; margin-top: 30px;">
-                    <button type="submit" name="action" value="save" class="btn-primary">💾 Guardar Configuración</button>
-                    <button type="submit" name="action" value="reset" class="btn-secondary">🔄 Restaurar Valores por Defecto</button>
-                </div>
-            </form>
-        </div>
-        <div class="admin-card">
-            <h3>📊 Estado Actual del Sistema</h3>
-            <div class="rules-grid">
-                <div class="rule-group">
-                    <h4>Configuración Activa</h4>
-                    <p><strong>Fecha de última actualización:</strong> {{ datetime.now().strftime('%Y-%m-%d %H:%M:%S') }}</p>
-                    <p><strong>Perfiles configurados:</strong> {{ rules.monto_maximo_por_perfil.keys()|list|length }}</p>
-                    <p><strong>Score mínimo:</strong> {{ rules.score_minimo }}</p>
-                    <p><strong>Antigüedad mínima:</strong> {{ rules.antiguedad_laboral_minima }} años</p>
-                    <p><strong>Monto máximo general:</strong> ${{ "{:,}".format(rules.monto_maximo_por_perfil.AAA) }}</p>
-                </div>
-                <div class="rule-group">
-                    <h4>Validación de Reglas</h4>
-                    {% set validation = validate_rules(rules) %}
-                    {% for item in validation %}
-                        <p style="color: {{ 'green' if item.startswith('✓') else 'red' }};">{{ item }}</p>
-                    {% endfor %}
-                </div>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-'''
-
-REPORTS_TEMPLATE = '''
-<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Dashboard de Reportes - Hotmart Credit</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); min-height: 100vh; }
-        .container { max-width: 1400px; margin: 0 auto; padding: 20px; }
-        .header { text-align: center; color: white; margin-bottom: 30px; }
-        .header h1 { font-size: 2.5rem; margin-bottom: 10px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3); }
-        .nav-buttons { display: flex; gap: 15px; justify-content: center; margin-bottom: 30px; }
-        .nav-btn { padding: 12px 24px; background: rgba(255,255,255,0.2); color: white; text-decoration: none; border-radius: 25px; border: 2px solid rgba(255,255,255,0.3); transition: all 0.3s ease; font-weight: 600; }
-        .nav-btn:hover { background: rgba(255,255,255,0.3); transform: translateY(-2px); }
-        .nav-btn.active { background: rgba(255,255,255,0.9); color: #667eea; }
-        .dashboard-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px; margin-bottom: 30px; }
-        .stat-card { background: white; border-radius: 15px; padding: 25px; box-shadow: 0 10px 30px rgba(0,0,0,0.2); text-align: center; }
-        .stat-number { font-size: 2.5rem; font-weight: bold; margin-bottom: 10px; }
-        .stat-label { color: #666; font-weight: 600; }
-        .approval-rate { color: #28a745; }
-        .rejection-rate { color: #dc3545; }
-        .total-amount { color: #667eea; }
-        .avg-amount { color: #fd7e14; }
-        .report-card { background: white; border-radius: 15px; padding: 30px; box-shadow: 0 10px 30px rgba(0,0,0,0.2); margin-bottom: 30px; }
-        .section-title { color: #333; margin-bottom: 20px; padding-bottom: 10px; border-bottom: 2px solid #667eea; display: flex; justify-content: space-between; align-items: center; }
-        .simulations-table { width: 100%; border-collapse: collapse; margin: 20px 0; }
-        .simulations-table th, .simulations-table td { padding: 12px; text-align: left; border-bottom: 1px solid #ddd; }
-        .simulations-table th { background: #f8f9fa; font-weight: 600; }
-        .status-approved { color: #28a745; font-weight: bold; }
-        .status-rejected { color: #dc3545; font-weight: bold; }
-        .profile-badge { display: inline-block; padding: 3px 8px; border-radius: 12px; font-weight: bold; font-size: 11px; text-transform: uppercase; }
-        .profile-AAA { background: #28a745; color: white; }
-        .profile-AA { background: #17a2b8; color: white; }
-        .profile-A { background: #007bff; color: white; }
-        .profile-BBB { background: #ffc107; color: black; }
-        .profile-BB { background: #fd7e14; color: white; }
-        .profile-B { background: #dc3545; color: white; }
-        .profile-RECHAZADO { background: #6c757d; color: white; }
-        .profile-stats { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin: 20px 0; }
-        .profile-stat { background: #f8f9fa; padding: 15px; border-radius: 10px; text-align: center; }
-        .no-data { text-align: center; color: #666; padding: 40px; font-style: italic; }
-        .btn-action { padding: 10px 20px; background: #667eea; color: white; text-decoration: none; border-radius: 5px; margin: 0 5px; font-weight: 600; transition: all 0.3s ease; }
-        .btn-action:hover { background: #5a67d8; }
-        .btn-clear { background: #dc3545; }
-        .btn-clear:hover { background: #c82333; }
-        .btn-print { background: #28a745; }
-        .btn-print:hover { background: #218838; }
-        .executive-summary { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 25px; border-radius: 15px; margin-bottom: 30px; }
-        .executive-summary h3 { margin-bottom: 15px; }
-        .summary-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; }
-        .summary-item { text-align: center; }
-        .summary-value { font-size: 1.8rem; font-weight: bold; margin-bottom: 5px; }
-        .summary-label { opacity: 0.9; font-size: 0.9rem; }
-        @media (max-width: 768px) {
-            .dashboard-grid { grid-template-columns: 1fr; }
-            .simulations-table { font-size: 14px; }
-            .simulations-table th, .simulations-table td { padding: 8px; }
-            .nav-buttons { flex-wrap: wrap; }
-        }
-        @media print {
-            body { background: white; }
-            .nav-buttons, .btn-action { display: none; }
-            .container { max-width: 100%; }
-            .header { color: black; }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>📊 Dashboard de Reportes</h1>
-            <p>Análisis y Estadísticas del Sistema de Evaluación Crediticia</p>
-        </div>
-        <div class="nav-buttons">
-            <a href="/" class="nav-btn">🏠 Evaluación</a>
-            <a href="/admin_login" class="nav-btn">⚙️ Administración</a>
-            <a href="/reports" class="nav-btn active">📊 Reportes</a>
-        </div>
-
-        {% if stats.total_simulations > 0 %}
-        <!-- Resumen Ejecutivo -->
-        <div class="executive-summary">
-            <h3>📈 Resumen Ejecutivo de Simulaciones</h3>
-            <div class="summary-grid">
-                <div class="summary-item">
-                    <div class="summary-value">{{ stats.total_simulations }}</div>
-                    <div class="summary-label">Total Simulaciones</div>
-                </div>
-                <div class="summary-item">
-                    <div class="summary-value">{{ "%.1f"|format(stats.approval_rate) }}%</div>
-                    <div class="summary-label">Tasa de Aprobación</div>
-                </div>
-                <div class="summary-item">
-                    <div class="summary-value">${{ "{:,.0f}".format(stats.total_approved_amount) }}</div>
-                    <div class="summary-label">Monto Total Aprobado</div>
-                </div>
-                <div class="summary-item">
-                    <div class="summary-value">${{ "{:,.0f}".format(stats.avg_approved_amount) }}</div>
-                    <div class="summary-label">Promedio por Crédito</div>
-                </div>
-            </div>
-        </div>
-
-        <!-- KPIs Principales -->
-        <div class="dashboard-grid">
-            <div class="stat-card">
-                <div class="stat-number approval-rate">{{ stats.approved_count }}</div>
-                <div class="stat-label">Créditos Aprobados</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number rejection-rate">{{ stats.rejected_count }}</div>
-                <div class="stat-label">Créditos Rechazados</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number total-amount">${{ "{:,.0f}".format(stats.total_approved_amount) }}</div>
-                <div class="stat-label">Monto Total Aprobado</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number avg-amount">${{ "{:,.0f}".format(stats.avg_approved_amount) }}</div>
-                <div class="stat-label">Promedio por Aprobación</div>
-            </div>
-        </div>
-
-        <!-- Estadísticas por Perfil -->
-        {% if stats.profile_stats %}
-        <div class="report-card">
-            <h3 class="section-title">📊 Distribución por Perfil de Riesgo</h3>
-            <div class="profile-stats">
-                {% for perfil, data in stats.profile_stats.items() %}
-                <div class="profile-stat">
-                    <h4><span class="profile-badge profile-{{ perfil }}">{{ perfil }}</span></h4>
-                    <p><strong>{{ data.count }}</strong> aprobaciones</p>
-                    <p><strong>${{ "{:,.0f}".format(data.total_amount) }}</strong> total</p>
-                    <p><strong>${{ "{:,.0f}".format(data.avg_amount) }}</strong> promedio</p>
-                    <p><strong>{{ "%.1f"|format(data.avg_rate) }}%</strong> tasa promedio</p>
-                </div>
-                {% endfor %}
-            </div>
-        </div>
-        {% endif %}
-
-        <!-- Detalle de Simulaciones -->
-        <div class="report-card">
-            <h3 class="section-title">
-                📋 Registro de Simulaciones (Últimas {{ simulations|length }})
-                <div>
-                    <a href="javascript:window.print()" class="btn-action btn-print">🖨️ Imprimir</a>
-                    <a href="/clear_session" class="btn-action btn-clear" onclick="return confirm('¿Está seguro de limpiar todas las simulaciones?')">🗑️ Limpiar</a>
-                </div>
-            </h3>
-            <div style="overflow-x: auto;">
-                <table class="simulations-table">
-                    <thead>
-                        <tr>
-                            <th>Fecha/Hora</th>
-                            <th>Cliente</th>
-                            <th>Edad</th>
-                            <th>Score</th>
-                            <th>Ingresos</th>
-                            <th>Antigüedad</th>
-                            <th>Resultado</th>
-                            <th>Perfil</th>
-                            <th>Monto Aprobado</th>
-                            <th>Tasa</th>
-                            <th>Motivo Rechazo</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for sim in simulations %}
-                        <tr>
-                            <td>{{ sim.timestamp }}</td>
-                            <td>{{ sim.nombre }}</td>
-                            <td>{{ sim.edad }}</td>
-                            <td>{{ sim.score_crediticio }}</td>
-                            <td>${{ "{:,.0f}".format(sim.ingresos_mensuales) }}</td>
-                            <td>{{ sim.antiguedad_laboral }} años</td>
-                            <td class="{% if sim.aprobado %}status-approved{% else %}status-rejected{% endif %}">
-                                {% if sim.aprobado %}✅ APROBADO{% else %}❌ RECHAZADO{% endif %}
-                            </td>
-                            <td><span class="profile-badge profile-{{ sim.perfil }}">{{ sim.perfil }}</span></td>
-                            <td>{% if sim.monto_aprobado > 0 %} ${{ "{:,.0f}".format(sim.monto_aprobado) }}{% else %}-{% endif %}</td>
-                            <td>{% if sim.tasa_anual > 0 %}{{ "%.1f"|format(sim.tasa_anual) }}%{% else %}-{% endif %}</td>
-                            <td style="max-width: 200px; overflow: hidden; text-overflow: ellipsis;">{{ sim.motivo_rechazo[:50] }}{% if sim.motivo_rechazo|length > 50 %}...{% endif %}</td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-            </div>
-        </div>
-
-        <!-- Análisis de Riesgos -->
-        <div class="report-card">
-            <h3 class="section-title">⚠️ Análisis de Factores de Rechazo</h3>
-            {% set rejected_sims = simulations | selectattr('aprobado', 'equalto', false) | list %}
-            {% if rejected_sims %}
-            <div class="profile-stats">
-                <div class="profile-stat">
-                    <h4>Total Rechazos</h4>
-                    <p><strong>{{ rejected_sims|length }}</strong> de {{ simulations|length }}</p>
-                    <p><strong>{{ "%.1f"|format((rejected_sims|length / simulations|length * 100) if simulations|length > 0 else 0) }}%</strong> de tasa de rechazo</p>
-                </div>
-                {% set score_rejects = rejected_sims | selectattr('score_crediticio', 'lt', 650) | list %}
-                <div class="profile-stat">
-                    <h4>Score Bajo</h4>
-                    <p><strong>{{ score_rejects|length }}</strong> rechazos</p>
-                    <p>Score < 650</p>
-                </div>
-                {% set income_rejects = rejected_sims | selectattr('ingresos_mensuales', 'lt', 15000) | list %}
-                <div class="profile-stat">
-                    <h4>Ingresos Bajos</h4>
-                    <p><strong>{{ income_rejects|length }}</strong> rechazos</p>
-                    <p>Ingresos < $15,000</p>
-                </div>
-                {% set exp_rejects = rejected_sims | selectattr('antiguedad_laboral', 'lt', 1) | list %}
-                <div class="profile-stat">
-                    <h4>Poca Experiencia</h4>
-                    <p><strong>{{ exp_rejects|length }}</strong> rechazos</p>
-                    <p>Antigüedad < 1 año</p>
-                </div>
-            </div>
-            {% else %}
-            <p class="no-data">No hay rechazos registrados en la sesión actual.</p>
-            {% endif %}
-        </div>
-
-        <!-- Footer del Reporte -->
-        <div class="report-card">
-            <h3 class="section-title">📝 Información del Reporte</h3>
-            <div class="profile-stats">
-                <div class="profile-stat">
-                    <h4>Generado</h4>
-                    <p>{{ datetime.now().strftime('%Y-%m-%d %H:%M:%S') }}</p>
-                </div>
-                <div class="profile-stat">
-                    <h4>Sistema</h4>
-                    <p>Hotmart Credit Simulator v2.0</p>
-                </div>
-                <div class="profile-stat">
-                    <h4>Alcance</h4>
-                    <p>Simulaciones de Sesión (Máx. 10)</p>
-                </div>
-                <div class="profile-stat">
-                    <h4>Uso</h4>
-                    <p>Evaluación del Módulo de Curso</p>
-                </div>
-            </div>
-        </div>
-
-        {% else %}
-        <!-- Sin Datos -->
-        <div class="report-card">
-            <div class="no-data">
-                <h3>📊 No hay simulaciones registradas</h3>
-                <p>Realice algunas evaluaciones de crédito para ver el dashboard de reportes.</p>
-                <a href="/" class="btn-action" style="margin-top: 20px;">🏠 Ir a Evaluaciones</a>
-            </div>
-        </div>
-        {% endif %}
-    </div>
-</body>
-</html>
-'''
+        return _json_response({'error': str(e)}, 500)
+
+@app.route('/assets/app.css')
+def stylesheet():
+    """Hoja de estilos ya comprimida con la mejor codificación que acepte el cliente"""
+    response = _precompressed_response(STYLESHEET, STYLESHEET_ENCODINGS, 'text/css',
+                                       app.jinja_env.globals['static_version'])
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['SEND_FILE_MAX_AGE_DEFAULT']
+    return response.make_conditional(request)
+
+@app.after_request
+def static_cache_headers(response):
+    """Marca como inmutables los estáticos pedidos con hash de versión (?v=)"""
+    if (request.endpoint in ('static', 'stylesheet') and 'v' in request.args
+            and response.status_code == 200):
+        response.cache_control.immutable = True
+    return response
+
+@app.after_request
+def minify_html(response):
+    """Minifica las respuestas HTML si MINIFY_HTML está activo"""
+    if (MINIFY_HTML and response.mimetype == 'text/html' and 'Content-Encoding' not in response.headers
+            and not response.direct_passthrough and not response.is_streamed):
+        body = response.get_data(as_text=True)
+        if body:
+            response.set_data(htmlmin.minify(body, remove_comments=True, remove_empty_space=True))
+    return response
+
+# Plantillas precompiladas a módulos Python (opcional): se generan en el build con
+#   python -c "from app import app; app.jinja_env.compile_templates('templates_compiled.zip', zip='deflated')"
+# y JINJA_COMPILED_TEMPLATES apunta al zip. Se usan tal cual, sin comparar con los
+# archivos: hay que regenerarlas cada vez que cambia templates/.
+_TEMPLATE_FILES = app.jinja_env.loader
+_compiled_templates = os.getenv('JINJA_COMPILED_TEMPLATES')
+if _compiled_templates and os.path.exists(_compiled_templates):
+    # ModuleLoader solo implementa load(): va en el entorno, antes del cargador de Flask
+    app.jinja_env.loader = ChoiceLoader([ModuleLoader(_compiled_templates), _TEMPLATE_FILES])
+
+# Compilar las plantillas al importar: la primera petición de cada página no
+# paga el parseo y, sin TEMPLATES_AUTO_RELOAD, Jinja no vuelve a revisarlas
+for _template in _TEMPLATE_FILES.list_templates():
+    app.jinja_env.get_template(_template)
 
 if __name__ == '__main__':
-    print("🚀 Iniciando Simulador de Crédito Hotmart - Versión Completa")
-    print("📊 Sistema de Evaluación Crediticia con Dashboard de Reportes")
-    print("🔐 Panel de Administración Protegido con Clave RAG123")
-    print("=" * 60)
-    
     load_business_rules()
-    print(f"✅ Reglas de negocio cargadas")
-    print(f"📋 Score mínimo: {business_rules['score_minimo']}")
-    print(f"💰 Monto máximo AAA: ${business_rules['monto_maximo_por_perfil']['AAA']:,}")
-    print(f"⚡ Ratio deuda máximo: {business_rules['ratio_deuda_ingreso_maximo']:.0%}")
-    print(f"👔 Antigüedad mínima: {business_rules['antiguedad_laboral_minima']} años")
-    
-    print("\n🌐 Acceso al sistema:")
-    print("   • Evaluación: http://localhost:5000/")
-    print("   • Administración: http://localhost:5000/admin_login (Clave: RAG123)")
-    print("   • Dashboard Reportes: http://localhost:5000/reports")
-    print("   • API Test AAA: http://localhost:5000/api/test/aaa")
-    print("   • API Reglas: http://localhost:5000/api/rules")
-    print("\n🎯 Características principales:")
-    print("   ✓ Autenticación administrativa segura")
-    print("   ✓ Antigüedad laboral en años (no meses)")
-    print("   ✓ Dashboard completo con estadísticas")
-    print("   ✓ Registro de máximo 10 simulaciones por sesión")
-    print("   ✓ Reporte ejecutivo para evaluación del módulo")
-    print("   ✓ Funcionalidad de impresión para reportes")
-    print("=" * 60)
+    # Banner completo en una sola escritura a stdout
+    banner = "\n".join([
+        "🚀 Iniciando Simulador de Crédito Hotmart - Versión Completa",
+        "📊 Sistema de Evaluación Crediticia con Dashboard de Reportes",
+        "🔐 Panel de Administración Protegido con Clave de Acceso",
+        "=" * 60,
+        "✅ Reglas de negocio cargadas",
+        f"📋 Score mínimo: {business_rules['score_minimo']}",
+        f"💰 Monto máximo AAA: ${business_rules['monto_maximo_por_perfil']['AAA']:,}",
+        f"⚡ Ratio deuda máximo: {business_rules['ratio_deuda_ingreso_maximo']:.0%}",
+        f"👔 Antigüedad mínima: {business_rules['antiguedad_laboral_minima']} años",
+        "",
+        "🌐 Acceso al sistema:",
+        "   • Evaluación: http://localhost:5000/",
+        "   • Administración: http://localhost:5000/admin_login (Clave: ADMIN_ACCESS_KEY)",
+        "   • Dashboard Reportes: http://localhost:5000/reports",
+        "   • API Test AAA: http://localhost:5000/api/test/aaa",
+        "   • API Reglas: http://localhost:5000/api/rules",
+        "",
+        "🎯 Características principales:",
+        "   ✓ Autenticación administrativa segura",
+        "   ✓ Antigüedad laboral en años (no meses)",
+        "   ✓ Dashboard completo con estadísticas",
+        "   ✓ Registro de máximo 10 simulaciones por sesión",
+        "   ✓ Reporte ejecutivo para evaluación del módulo",
+        "   ✓ Funcionalidad de impresión para reportes",
+        "=" * 60,
+    ])
+    sys.stdout.write(banner + "\n")
+    sys.stdout.flush()
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Depurador y recargador solo bajo demanda; en otro caso un servidor WSGI con hilos
+    port = int(os.getenv('PORT', '5000'))
+    if os.getenv('FLASK_DEBUG') == '1':
+        app.run(debug=True, host='0.0.0.0', port=port)
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            app.run(host='0.0.0.0', port=port, threaded=True)
+        else:
+            serve(app, host='0.0.0.0', port=port, threads=int(os.getenv('WSGI_THREADS', '8')))
@@ -0,0 +1,13 @@
+"""Configuración de gunicorn (se lee sola al ejecutar `gunicorn app:app` en esta carpeta)"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Un solo proceso por defecto: las simulaciones de sesión viven en la memoria del proceso
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+# Hilos por proceso: las evaluaciones concurrentes no esperan en fila
+worker_class = 'gthread'
+threads = int(os.getenv('WSGI_THREADS', '8'))
+
+# Reglas, tablas de scoring, JIT de numba y plantillas se cargan una vez antes del fork
+preload_app = True
@@ -0,0 +1,200 @@
+"""Pruebas de las reglas, la evaluación individual y por lotes, y las páginas cacheadas"""
+import importlib
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def app_module(tmp_path, monkeypatch):
+    # business_rules.json se lee y escribe en el directorio actual
+    monkeypatch.chdir(tmp_path)
+    module = importlib.import_module('app')
+    module.replace_business_rules(module.default_rules())
+    return module
+
+
+@pytest.fixture
+def admin_client(app_module):
+    client = app_module.app.test_client()
+    client.post('/admin_login', data={'access_key': 'RAG123'})
+    return client
+
+
+def test_default_rules_are_read_only(app_module):
+    with pytest.raises(TypeError):
+        app_module.DEFAULT_RULES['tasas_por_perfil']['AAA']['min'] = 1.0
+
+
+def test_default_rules_returns_independent_copies(app_module):
+    rules = app_module.default_rules()
+    rules['tasas_por_perfil']['AAA']['min'] = 1.0
+    assert app_module.default_rules()['tasas_por_perfil']['AAA']['min'] == 8.5
+
+
+def test_admin_save_and_reset_keep_defaults(app_module, admin_client):
+    form = {'action': 'save'}
+    for perfil in app_module.PERFILES:
+        form.update({f'monto_{perfil}': '90000', f'tasa_min_{perfil}': '9.5',
+                     f'tasa_max_{perfil}': '20', f'plazo_max_{perfil}': '36'})
+    assert admin_client.post('/admin', data=form).status_code == 200
+    assert app_module.business_rules['tasas_por_perfil']['AAA']['min'] == 9.5
+    assert app_module.DEFAULT_RULES['tasas_por_perfil']['AAA']['min'] == 8.5
+
+    assert admin_client.post('/admin', data={'action': 'reset'}).status_code == 200
+    assert app_module.business_rules['tasas_por_perfil']['AAA']['min'] == 8.5
+    assert admin_client.get('/api/rules').get_json()['tasas_por_perfil']['AAA']['min'] == 8.5
+
+
+SOLICITUD = {'nombre': 'Ana', 'edad': 40, 'score_crediticio': 800, 'ingresos_mensuales': 60000,
+             'antiguedad_laboral': 6, 'deudas_actuales': 0}
+
+
+def test_rules_change_invalidates_cached_evaluations(app_module):
+    evaluator = app_module.evaluator
+    assert evaluator.evaluate_credit_request(dict(SOLICITUD))['oferta_credito']['monto_aprobado'] == 200000
+
+    reglas = app_module.default_rules()
+    reglas['monto_maximo_por_perfil']['AAA'] = 90000
+    snapshot = app_module._rules_snapshot
+    assert app_module.replace_business_rules(reglas)
+
+    assert app_module._rules_snapshot.generation == snapshot.generation + 1
+    assert app_module._rules_snapshot.profile_lut['AAA'][0] == 90000
+    assert evaluator.evaluate_credit_request(dict(SOLICITUD))['oferta_credito']['monto_aprobado'] == 90000
+
+
+def test_invalid_rules_file_is_parsed_once(app_module, capsys):
+    with open('business_rules.json', 'w') as f:
+        f.write('{no es json')
+    app_module.load_business_rules()
+    snapshot = app_module._rules_snapshot
+    app_module.load_business_rules()
+    app_module.load_business_rules()
+
+    assert capsys.readouterr().out.count('Error cargando reglas') == 1
+    assert app_module._rules_snapshot is snapshot
+    assert snapshot.rules['score_minimo'] == app_module.DEFAULT_RULES['score_minimo']
+
+
+def _random_requests(seed, n=2000):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(n):
+        records.append({
+            'score_crediticio': rng.randint(250, 900),
+            'ingresos_mensuales': rng.choice([rng.uniform(0, 90000), 15000, 20000, 50000, 0, -5]),
+            'antiguedad_laboral': rng.randint(-1, 10),
+            'edad': rng.randint(-5, 120),
+            'deudas_actuales': rng.choice([rng.uniform(0, 30000), 0]),
+            'monto_solicitado': rng.choice([None, 0, rng.uniform(1000, 250000), 50000, 100000]),
+        })
+    return records + [{'edad': 'x'}, {}, {'score_crediticio': None}]
+
+
+def _assert_batch_matches_scalar(evaluator, records):
+    for data, batch in zip(records, evaluator.evaluate_batch(records)):
+        scalar = evaluator.evaluate_credit_request(data)
+        scalar.pop('fecha_evaluacion', None)
+        batch.pop('fecha_evaluacion', None)
+        # repr también distingue 200000 de 200000.0
+        assert repr(batch) == repr(scalar), data
+
+
+@pytest.mark.parametrize('cambios', [
+    {},
+    {'score_minimo': 500, 'ingresos_minimos': 5000, 'ratio_deuda_ingreso_maximo': 0.8},
+    {'plazos_por_perfil': {'AAA': {'min': 12, 'max': 0}}},
+])
+def test_evaluate_batch_matches_single_evaluation(app_module, cambios):
+    reglas = app_module.default_rules()
+    for key, value in cambios.items():
+        if isinstance(value, dict):
+            for perfil, valores in value.items():
+                reglas[key][perfil].update(valores)
+        else:
+            reglas[key] = value
+    app_module.replace_business_rules(reglas)
+    _assert_batch_matches_scalar(app_module.evaluator, _random_requests(seed=len(cambios)))
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+def test_evaluate_batch_route_accepts_json_list(client):
+    rechazada = dict(SOLICITUD, score_crediticio=400)
+    response = client.post('/evaluate/batch', json=[SOLICITUD, rechazada])
+    assert response.status_code == 200
+    aprobada, rechazo = response.get_json()
+    assert aprobada['aprobado'] and aprobada['oferta_credito']['monto_aprobado'] == 200000
+    assert not rechazo['aprobado'] and rechazo['motivo_rechazo'] == 'No cumple requisitos básicos'
+
+
+def test_evaluate_batch_route_accepts_csv(client):
+    campos = list(SOLICITUD)
+    body = ','.join(campos) + '\n' + ','.join(str(SOLICITUD[c]) for c in campos) + '\n'
+    response = client.post('/evaluate/batch', data=body, content_type='text/csv')
+    assert response.status_code == 200
+    from_csv = response.get_json()
+    from_json = client.post('/evaluate/batch', json=[SOLICITUD]).get_json()
+    for resultado in from_csv + from_json:
+        resultado.pop('fecha_evaluacion')
+    assert from_csv == from_json
+
+
+def test_evaluate_batch_route_rejects_non_list(client):
+    response = client.post('/evaluate/batch', json=SOLICITUD)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_evaluate_batch_route_reports_malformed_rows_in_place(client):
+    response = client.post('/evaluate/batch', json=[SOLICITUD, dict(SOLICITUD, edad='x'), SOLICITUD])
+    assert response.status_code == 200
+    primera, mala, ultima = response.get_json()
+    assert primera['aprobado'] and ultima['aprobado']
+    assert mala['error_tecnico'] is True and not mala['aprobado']
+
+
+def _get(client, path, etag=None):
+    headers = {'If-None-Match': etag} if etag else {}
+    response = client.get(path, headers=headers)
+    # Las páginas transmitidas deben consumirse antes de la siguiente petición
+    response.get_data()
+    return response
+
+
+def test_reports_etag_revalidation(client):
+    primera = _get(client, '/reports')
+    etag = primera.headers['ETag']
+    assert primera.status_code == 200 and etag.startswith('W/')
+    assert _get(client, '/reports', etag).status_code == 304
+
+    # /api/test registra una simulación nueva
+    assert client.get('/api/test/aaa').status_code == 200
+    despues = _get(client, '/reports', etag)
+    assert despues.status_code == 200
+    assert despues.headers['ETag'] != etag
+
+
+def test_admin_etag_revalidation(admin_client):
+    # La primera carga consume el mensaje flash del inicio de sesión
+    _get(admin_client, '/admin')
+    primera = _get(admin_client, '/admin')
+    etag = primera.headers['ETag']
+    assert primera.status_code == 200 and etag.startswith('W/')
+    assert _get(admin_client, '/admin', etag).status_code == 304
+
+    form = {'action': 'save', 'score_minimo': '640'}
+    guardado = admin_client.post('/admin', data=form)
+    assert guardado.status_code == 200 and 'guardada' in guardado.get_data(as_text=True)
+    despues = _get(admin_client, '/admin', etag)
+    assert despues.status_code == 200
+    assert despues.headers['ETag'] != etag
+    assert 'value="640"' in despues.get_data(as_text=True)